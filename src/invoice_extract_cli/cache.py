@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR_ENV = "INVOICE_EXTRACT_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    override = os.getenv(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base / "invoice-extract"
+
+
+def read_json_cache(path: Path) -> Any | None:
+    # Cache entries are best-effort: unreadable or corrupt files count as misses.
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_cache(path: Path, payload: Any) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def touch_json_cache(path: Path) -> None:
+    # Marks an entry as just used for prune_json_cache. The time is set explicitly because file
+    # timestamps come from a coarse kernel clock that can't order back-to-back writes.
+    now = time.time_ns()
+    try:
+        os.utime(path, ns=(now, now))
+    except OSError:
+        pass
+
+
+def prune_json_cache(directory: Path, max_entries: int) -> None:
+    # Keeps the max_entries most recently used entries in directory and deletes the rest.
+    candidates: list[tuple[int, str]] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    candidates.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        return
+    if len(candidates) <= max_entries:
+        return
+    candidates.sort()
+    for _, path in candidates[: len(candidates) - max_entries]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class ResponseCache:
+    """Gemini responses and per-PDF results kept in SQLite, keyed by a hash of what produced them."""
+
+    def __init__(self, path: Path, ttl_seconds: int, refresh: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        # A refreshing cache never answers lookups but still stores what it is given.
+        self.refresh = refresh
+        self._connection: Any | None = None
+        self._pruned = False
+        # Batch runs use the cache from both the PDF worker thread and the event loop thread.
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        import sqlite3
+
+        if self.refresh:
+            return None
+        connection = self._connect()
+        if connection is None:
+            return None
+        try:
+            with self._lock:
+                row = connection.execute(
+                    "SELECT payload FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, int(time.time()) - self.ttl_seconds),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, payload: str) -> None:
+        import sqlite3
+
+        connection = self._connect()
+        if connection is None:
+            return
+        now = int(time.time())
+        try:
+            with self._lock, connection:
+                if not self._pruned:
+                    connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                    self._pruned = True
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, payload, created_at) VALUES (?, ?, ?)",
+                    (key, payload, now),
+                )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> Any | None:
+        # Like the JSON caches this is best-effort: a database that can't be opened means misses.
+        if self._connection is not None:
+            return self._connection
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._open_connection()
+        return self._connection
+
+    def _open_connection(self) -> Any | None:
+        import sqlite3
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            # WAL lets concurrent CLI runs read while another one writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, payload TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+        except (OSError, sqlite3.Error):
+            return None
+        return connection
+
+
+def default_response_cache_path() -> Path:
+    return default_cache_dir() / "gemini.sqlite"
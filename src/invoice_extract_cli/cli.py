@@ -1,39 +1,66 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import os
 import sys
+from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
+import orjson
 import typer
 
-from .config import ConfigError, resolve_cli_settings
+from .cache import ResponseCache, default_response_cache_path
+from .config import ConfigError, ResolvedCliSettings, resolve_cli_settings
 from .gemini_client import GeminiClientError, GeminiInvoiceExtractor
-from .models import ExtractionResult
+from .local_extract import try_local_extract
 from .normalize import count_words, make_filename_stub_with_options, normalize_invoice_date, sanitize_short_description
 from .pdf_ingest import (
     PasswordProtectedPdfError,
     PdfIngestError,
     extract_embedded_text,
+    extract_embedded_text_cached,
+    image_mime_type,
     looks_like_usable_text,
-    render_pdf_pages_to_png_bytes,
+    open_pdf_session,
+    pdf_fingerprint,
+    render_pdf_pages_cached,
+    stat_input_pdf_path,
     validate_input_pdf_path,
 )
 
+if TYPE_CHECKING:
+    from .models import ExtractionResult, GeminiResponseSchema
+
+
 class OcrMode(str, Enum):
     AUTO = "auto"
     GEMINI = "gemini"
 
 
+class ImageFormat(str, Enum):
+    JPEG = "jpeg"
+    PNG = "png"
+
+
 EXIT_BAD_INPUT = 2
 EXIT_PDF_ERROR = 3
 EXIT_API_ERROR = 4
 EXIT_INTERNAL = 10
 
+# AUTO mode stops reading further pages once embedded text scores at least this high.
+TEXT_QUALITY_SHORT_CIRCUIT = 0.7
+# Embedded text scoring below the usable threshold but at least this high is sent to
+# Gemini together with a page-1 image instead of rendering every page.
+HYBRID_TEXT_QUALITY_MIN = 0.35
+# Maximum number of Gemini requests in flight when several PDFs are processed at once.
+BATCH_CONCURRENCY = 8
+
 
 def invoice_extract_command(
-    pdf_path: Optional[Path] = typer.Argument(None, exists=False, help="Path to the invoice PDF"),
+    pdf_paths: Optional[list[Path]] = typer.Argument(None, exists=False, help="Path(s) to invoice PDFs"),
     config: Optional[Path] = typer.Option(
         None,
         "--config",
@@ -62,6 +89,39 @@ def invoice_extract_command(
     ),
     max_pages: Optional[int] = typer.Option(None, "--max-pages", min=1, help="Maximum number of pages to inspect"),
     ocr_mode: Optional[OcrMode] = typer.Option(None, "--ocr-mode", case_sensitive=False),
+    image_format: Optional[ImageFormat] = typer.Option(
+        None,
+        "--image-format",
+        case_sensitive=False,
+        help="Page image format sent to Gemini vision (default: jpeg)",
+    ),
+    render_dpi: Optional[int] = typer.Option(
+        None,
+        "--render-dpi",
+        min=72,
+        help="Page rendering DPI for Gemini vision (default: 150)",
+    ),
+    local_extract: Optional[bool] = typer.Option(
+        None,
+        "--local-extract/--no-local-extract",
+        help="Read date/description from clean embedded text without calling Gemini when possible",
+    ),
+    cache: Optional[bool] = typer.Option(
+        None,
+        "--cache/--no-cache",
+        help="Reuse stored results, embedded text and Gemini responses for identical PDFs and requests (default: on)",
+    ),
+    cache_ttl_seconds: Optional[int] = typer.Option(
+        None,
+        "--cache-ttl-seconds",
+        min=1,
+        help="How long stored Gemini responses stay valid (default: 30 days)",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Ignore stored results and Gemini responses for this run (fresh ones are still stored)",
+    ),
     dry_run: Optional[bool] = typer.Option(
         None,
         "--dry-run/--no-dry-run",
@@ -102,6 +162,11 @@ def invoice_extract_command(
             locale=locale,
             max_pages=max_pages,
             ocr_mode=ocr_mode.value if ocr_mode is not None else None,
+            image_format=image_format.value if image_format is not None else None,
+            render_dpi=render_dpi,
+            local_extract=local_extract,
+            cache=cache,
+            cache_ttl_seconds=cache_ttl_seconds,
             dry_run=dry_run,
             rename=rename,
             filename_separator=filename_separator,
@@ -124,64 +189,179 @@ def invoice_extract_command(
                 debug=settings.debug,
             )
             if settings.debug:
-                typer.echo(json.dumps(output, indent=2, ensure_ascii=True))
+                _write_json(output)
             return
 
-        if pdf_path is None:
+        if not pdf_paths:
             raise ValueError("Missing PDF path. Provide <pdf_path> or use --list-models.")
         if settings.dry_run and settings.rename:
             raise ValueError("Options --dry-run and --rename are mutually exclusive.")
 
-        source_path = pdf_path.resolve()
-        result = run_invoice_extraction(
+        _debug(
+            settings.debug,
+            (
+                f"Using model={settings.model}, locale={settings.locale}, "
+                f"filename_separator={settings.filename_separator!r}, "
+                f"filename_suffix={settings.filename_suffix!r}, "
+                f"filename_date_separator={settings.filename_date_separator!r}"
+            ),
+        )
+
+        response_cache = (
+            ResponseCache(default_response_cache_path(), settings.cache_ttl_seconds, refresh=force)
+            if settings.cache
+            else None
+        )
+    except Exception as exc:
+        _emit_error(*_classify_error(exc))
+
+    try:
+        if len(pdf_paths) == 1:
+            outcomes = [_extract_one(pdf_paths[0], settings, response_cache)]
+        else:
+            import asyncio
+
+            outcomes = asyncio.run(_extract_batch(pdf_paths, settings, response_cache))
+    finally:
+        if response_cache is not None:
+            response_cache.close()
+
+    # Renames and confirmation prompts run sequentially, in argument order.
+    results: list[ExtractionResult] = []
+    exit_code = 0
+    for pdf_path, outcome in zip(pdf_paths, outcomes):
+        try:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            _apply_result(pdf_path, outcome, settings)
+        except Exception as exc:
+            message, code = _classify_error(exc)
+            _report_error(message, code)
+            exit_code = exit_code or code
+            continue
+        results.append(outcome)
+
+    if settings.debug and results:
+        _write_out(_dump_results(results[0] if len(pdf_paths) == 1 else results))
+    if exit_code:
+        raise typer.Exit(code=exit_code)
+
+
+def _extract_one(
+    pdf_path: Path,
+    settings: ResolvedCliSettings,
+    response_cache: ResponseCache | None,
+) -> ExtractionResult | Exception:
+    try:
+        return run_invoice_extraction(
             pdf_path=pdf_path,
+            response_cache=response_cache,
             api_key=settings.gemini_api_key,
             model=settings.model,
             locale=settings.locale,
             max_pages=settings.max_pages,
             ocr_mode=OcrMode(settings.ocr_mode),
+            image_format=ImageFormat(settings.image_format),
+            render_dpi=settings.render_dpi,
+            local_extract=settings.local_extract,
+            cache=settings.cache,
             filename_separator=settings.filename_separator,
             filename_suffix=settings.filename_suffix,
             filename_date_separator=settings.filename_date_separator,
             timeout_seconds=settings.timeout_seconds,
             debug=settings.debug,
         )
+    except Exception as exc:
+        return exc
+
+
+async def _extract_batch(
+    pdf_paths: list[Path],
+    settings: ResolvedCliSettings,
+    response_cache: ResponseCache | None,
+) -> list[ExtractionResult | BaseException]:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    # PyMuPDF is not thread-safe, so all PDF reading/rendering goes through a single
+    # worker thread; only the Gemini requests overlap, bounded by the semaphore.
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    prepare = partial(
+        _prepare_extraction,
+        model=settings.model,
+        result_cache=response_cache,
+        max_pages=settings.max_pages,
+        ocr_mode=OcrMode(settings.ocr_mode),
+        image_format=ImageFormat(settings.image_format),
+        render_dpi=settings.render_dpi,
+        locale=settings.locale,
+        local_extract=settings.local_extract,
+        cache=settings.cache,
+        debug=settings.debug,
+    )
 
-        target_path = build_renamed_path(source_path, result.filename_stub)
-        if settings.dry_run:
-            typer.echo(format_rename_message(source_path, target_path))
-        elif settings.rename:
-            perform_rename(source_path, target_path)
-        elif not settings.debug:
-            for line in format_detection_summary(result, source_path, target_path):
-                typer.echo(line)
-            if can_prompt_for_confirmation():
-                should_rename = typer.confirm(
-                    f'Rename "{source_path.name}" to "{target_path.name}"?',
-                    default=True,
+    # One extractor (and so one Gemini client/connection pool) serves every file in the batch. It is
+    # built on the event loop when the first file needs Gemini, so inputs are validated and files
+    # answered locally or from the cache never depend on the API key.
+    extractor: GeminiInvoiceExtractor | None = None
+
+    def get_extractor() -> GeminiInvoiceExtractor:
+        nonlocal extractor
+        if extractor is None:
+            extractor = GeminiInvoiceExtractor(
+                api_key=settings.gemini_api_key,
+                model=settings.model,
+                timeout_seconds=settings.timeout_seconds,
+                locale=settings.locale,
+                response_cache=response_cache,
+            )
+        return extractor
+
+    async def process(pdf_path: Path) -> ExtractionResult:
+        prepared = await loop.run_in_executor(pdf_executor, prepare, pdf_path)
+        response = prepared.local_response
+        if response is None:
+            async with semaphore:
+                response = await get_extractor().extract_async(
+                    text=prepared.text,
+                    images=prepared.images,
+                    mime_type=prepared.mime_type,
                 )
-                if should_rename:
-                    perform_rename(source_path, target_path)
-                else:
-                    typer.echo("Skipped rename.")
+        _store_result(response_cache, prepared, response)
+        return _finalize_extraction(
+            prepared,
+            response,
+            filename_separator=settings.filename_separator,
+            filename_suffix=settings.filename_suffix,
+            filename_date_separator=settings.filename_date_separator,
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as pdf_executor:
+        return await asyncio.gather(*(process(pdf_path) for pdf_path in pdf_paths), return_exceptions=True)
+
+
+def _apply_result(pdf_path: Path, result: ExtractionResult, settings: ResolvedCliSettings) -> None:
+    source_path = pdf_path.resolve()
+    target_path = build_renamed_path(source_path, result.filename_stub)
+    if settings.dry_run:
+        typer.echo(format_rename_message(source_path, target_path))
+    elif settings.rename:
+        perform_rename(source_path, target_path)
+    elif not settings.debug:
+        for line in format_detection_summary(result, source_path, target_path):
+            typer.echo(line)
+        if can_prompt_for_confirmation():
+            should_rename = typer.confirm(
+                f'Rename "{source_path.name}" to "{target_path.name}"?',
+                default=True,
+            )
+            if should_rename:
+                perform_rename(source_path, target_path)
             else:
-                typer.echo('Non-interactive mode detected. Use "--rename" to apply rename.')
-    except (FileNotFoundError, IsADirectoryError, ValueError) as exc:
-        _emit_error(str(exc), EXIT_BAD_INPUT)
-    except FileExistsError as exc:
-        _emit_error(str(exc), EXIT_BAD_INPUT)
-    except ConfigError as exc:
-        _emit_error(str(exc), EXIT_BAD_INPUT)
-    except (PasswordProtectedPdfError, PdfIngestError) as exc:
-        _emit_error(str(exc), EXIT_PDF_ERROR)
-    except GeminiClientError as exc:
-        _emit_error(str(exc), EXIT_API_ERROR)
-    except Exception as exc:  # pragma: no cover - safety net
-        _emit_error(f"Unexpected error: {exc}", EXIT_INTERNAL)
-
-    output = result.model_dump()
-    if settings.debug:
-        typer.echo(json.dumps(output, indent=2, ensure_ascii=True))
+                typer.echo("Skipped rename.")
+        else:
+            typer.echo('Non-interactive mode detected. Use "--rename" to apply rename.')
 
 
 def run_invoice_extraction(
@@ -195,52 +375,287 @@ def run_invoice_extraction(
     filename_suffix: str,
     filename_date_separator: str,
     timeout_seconds: int,
+    image_format: ImageFormat = ImageFormat.JPEG,
+    render_dpi: int = 150,
     debug: bool = False,
+    source_stat: os.stat_result | None = None,
+    extractor: GeminiInvoiceExtractor | None = None,
+    local_extract: bool = True,
+    cache: bool = True,
+    response_cache: ResponseCache | None = None,
 ) -> ExtractionResult:
-    validated_path = validate_input_pdf_path(pdf_path)
+    # Stored results are looked up before any extractor exists, so a rerun answered from the
+    # cache needs neither the API key nor a Gemini client.
+    prepared = _prepare_extraction(
+        pdf_path,
+        model=model,
+        result_cache=response_cache,
+        max_pages=max_pages,
+        ocr_mode=ocr_mode,
+        image_format=image_format,
+        render_dpi=render_dpi,
+        locale=locale,
+        local_extract=local_extract,
+        cache=cache,
+        debug=debug,
+        source_stat=source_stat,
+    )
+    gemini_response = prepared.local_response
+    if gemini_response is None:
+        # Built only now, so a bad input path or a locally answered file never depends on the API key.
+        if extractor is None:
+            extractor = GeminiInvoiceExtractor(
+                api_key=api_key,
+                model=model,
+                timeout_seconds=timeout_seconds,
+                locale=locale,
+                response_cache=response_cache,
+            )
+        gemini_response = extractor.extract(
+            text=prepared.text,
+            images=prepared.images,
+            mime_type=prepared.mime_type,
+        )
+    _store_result(response_cache, prepared, gemini_response)
+    return _finalize_extraction(
+        prepared,
+        gemini_response,
+        filename_separator=filename_separator,
+        filename_suffix=filename_suffix,
+        filename_date_separator=filename_date_separator,
+    )
+
+
+@dataclass
+class _PreparedExtraction:
+    """Everything decided from the PDF itself, before the Gemini request is sent."""
+
+    validated_path: Path
+    extraction_method: str
+    warnings: list[str]
+    text: str | None = None
+    images: list[bytes] | None = None
+    mime_type: str = "image/png"
+    # Set when the answer was read locally (or reused from an earlier run) and no Gemini request is needed.
+    local_response: GeminiResponseSchema | None = None
+    # Where the finished answer is stored for later runs over the same PDF content.
+    result_key: str | None = None
+
+
+def _prepare_extraction(
+    pdf_path: Path,
+    *,
+    max_pages: int,
+    ocr_mode: OcrMode,
+    image_format: ImageFormat,
+    render_dpi: int,
+    locale: str = "pl",
+    local_extract: bool = True,
+    debug: bool = False,
+    source_stat: os.stat_result | None = None,
+    model: str = "",
+    result_cache: ResponseCache | None = None,
+    cache: bool = True,
+) -> _PreparedExtraction:
+    if source_stat is None:
+        source_stat = stat_input_pdf_path(pdf_path)
+    validated_path = validate_input_pdf_path(pdf_path, stat_result=source_stat)
 
     _debug(
         debug,
         (
-            f"Using model={model}, locale={locale}, max_pages={max_pages}, ocr_mode={ocr_mode.value}, "
-            f"filename_separator={filename_separator!r}, filename_suffix={filename_suffix!r}, "
-            f"filename_date_separator={filename_date_separator!r}"
+            f"Preparing {validated_path.name}: max_pages={max_pages}, ocr_mode={ocr_mode.value}, "
+            f"image_format={image_format.value}, render_dpi={render_dpi}"
         ),
     )
 
-    extractor = GeminiInvoiceExtractor(
-        api_key=api_key,
-        model=model,
-        timeout_seconds=timeout_seconds,
+    result_key = None
+    if result_cache is not None:
+        # The PDF's content plus every setting that shapes the answer; the file name is left out
+        # so an invoice that was already renamed is still recognised.
+        key_source = "|".join(
+            (
+                pdf_fingerprint(validated_path),
+                model,
+                locale,
+                str(max_pages),
+                ocr_mode.value,
+                image_format.value,
+                str(render_dpi),
+                str(local_extract),
+            )
+        )
+        result_key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        cached = _cached_result(result_cache, result_key, validated_path)
+        if cached is not None:
+            _debug(debug, f"Reusing the stored result for {validated_path.name}; skipping PDF processing")
+            return cached
+
+    prepared = _prepare_from_pdf(
+        validated_path,
+        source_stat,
+        max_pages=max_pages,
+        ocr_mode=ocr_mode,
+        image_format=image_format,
+        render_dpi=render_dpi,
         locale=locale,
+        local_extract=local_extract,
+        cache=cache,
+        debug=debug,
     )
+    prepared.result_key = result_key
+    return prepared
 
-    warnings: list[str] = []
-    extraction_method = "gemini_vision"
-    invoice_date_raw: str | None = None
 
-    if ocr_mode == OcrMode.AUTO:
-        text_extraction = extract_embedded_text(validated_path, max_pages=max_pages)
-        _debug(
-            debug,
-            f"Embedded text pages={text_extraction.pages_examined} quality={text_extraction.quality_score:.2f}",
-        )
+def _prepare_from_pdf(
+    validated_path: Path,
+    source_stat: os.stat_result,
+    *,
+    max_pages: int,
+    ocr_mode: OcrMode,
+    image_format: ImageFormat,
+    render_dpi: int,
+    locale: str,
+    local_extract: bool,
+    cache: bool,
+    debug: bool,
+) -> _PreparedExtraction:
+    # Text extraction and any follow-up rendering share one open document.
+    with open_pdf_session(validated_path) as session:
+        warnings: list[str] = []
+        mime_type = image_mime_type(image_format.value)
+
+        if ocr_mode == OcrMode.AUTO:
+            # The text cache holds invoice contents in plain JSON, so it is only used when caching is on.
+            if cache:
+                text_extraction = extract_embedded_text_cached(
+                    validated_path,
+                    max_pages=max_pages,
+                    quality_short_circuit=TEXT_QUALITY_SHORT_CIRCUIT,
+                    stat_result=source_stat,
+                    session=session,
+                )
+            else:
+                text_extraction = extract_embedded_text(
+                    validated_path,
+                    max_pages=max_pages,
+                    quality_short_circuit=TEXT_QUALITY_SHORT_CIRCUIT,
+                    session=session,
+                )
+            _debug(
+                debug,
+                f"Embedded text pages={text_extraction.pages_examined} quality={text_extraction.quality_score:.2f}",
+            )
 
-        if text_extraction.combined_text and looks_like_usable_text(text_extraction.quality_score):
-            extraction_method = "pdf_text"
-            gemini_response = extractor.extract_from_text(text_extraction.combined_text)
-        else:
+            if text_extraction.combined_text and looks_like_usable_text(text_extraction.quality_score):
+                local_response = try_local_extract(text_extraction.combined_text, locale) if local_extract else None
+                if local_response is not None:
+                    _debug(debug, "Read invoice date and description locally from embedded text; skipping Gemini")
+                    return _PreparedExtraction(
+                        validated_path,
+                        "local_regex",
+                        warnings,
+                        local_response=local_response,
+                    )
+                return _PreparedExtraction(
+                    validated_path,
+                    "pdf_text",
+                    warnings,
+                    text=text_extraction.combined_text,
+                )
+            if text_extraction.combined_text and text_extraction.quality_score >= HYBRID_TEXT_QUALITY_MIN:
+                warnings.append(
+                    f"Using embedded text plus first page image due to borderline text quality "
+                    f"({text_extraction.quality_score:.2f})"
+                )
+                images = render_pdf_pages_cached(
+                    validated_path,
+                    max_pages=1,
+                    dpi=render_dpi,
+                    image_format=image_format.value,
+                    stat_result=source_stat,
+                    session=session,
+                )
+                _debug(debug, "Rendered first page image for hybrid text + vision extraction")
+                return _PreparedExtraction(
+                    validated_path,
+                    "hybrid",
+                    warnings,
+                    text=text_extraction.combined_text,
+                    images=images,
+                    mime_type=mime_type,
+                )
             warnings.append(
                 f"Falling back to Gemini vision due to low text quality ({text_extraction.quality_score:.2f})"
             )
-            images = render_pdf_pages_to_png_bytes(validated_path, max_pages=max_pages)
+            images = render_pdf_pages_cached(
+                validated_path,
+                max_pages=max_pages,
+                dpi=render_dpi,
+                image_format=image_format.value,
+                stat_result=source_stat,
+                session=session,
+            )
             _debug(debug, f"Rendered {len(images)} page image(s) for Gemini vision fallback")
-            gemini_response = extractor.extract_from_images(images)
-    else:
-        images = render_pdf_pages_to_png_bytes(validated_path, max_pages=max_pages)
-        _debug(debug, f"Rendered {len(images)} page image(s) for Gemini vision mode")
-        gemini_response = extractor.extract_from_images(images)
+        else:
+            images = render_pdf_pages_cached(
+                validated_path,
+                max_pages=max_pages,
+                dpi=render_dpi,
+                image_format=image_format.value,
+                stat_result=source_stat,
+                session=session,
+            )
+            _debug(debug, f"Rendered {len(images)} page image(s) for Gemini vision mode")
+
+        return _PreparedExtraction(validated_path, "gemini_vision", warnings, images=images, mime_type=mime_type)
+
+
+def _cached_result(result_cache: ResponseCache, result_key: str, validated_path: Path) -> _PreparedExtraction | None:
+    payload = result_cache.get(result_key)
+    if payload is None:
+        return None
+    from .models import GeminiResponseSchema
+
+    # A stored result that no longer loads (e.g. after a schema change) is just a miss.
+    try:
+        stored = orjson.loads(payload)
+        return _PreparedExtraction(
+            validated_path,
+            stored["extraction_method"],
+            list(stored["warnings"]),
+            local_response=GeminiResponseSchema.model_validate(stored["response"]),
+        )
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
 
+def _store_result(
+    result_cache: ResponseCache | None,
+    prepared: _PreparedExtraction,
+    gemini_response: GeminiResponseSchema,
+) -> None:
+    if result_cache is None or prepared.result_key is None:
+        return
+    payload = {
+        "extraction_method": prepared.extraction_method,
+        "warnings": prepared.warnings,
+        "response": gemini_response.model_dump(),
+    }
+    result_cache.put(prepared.result_key, orjson.dumps(payload).decode("utf-8"))
+
+
+def _finalize_extraction(
+    prepared: _PreparedExtraction,
+    gemini_response: GeminiResponseSchema,
+    *,
+    filename_separator: str,
+    filename_suffix: str,
+    filename_date_separator: str,
+) -> ExtractionResult:
+    from .models import ExtractionResult
+
+    warnings = list(prepared.warnings)
     invoice_date_raw = gemini_response.invoice_date_raw
     invoice_date = normalize_invoice_date(gemini_response.invoice_date_iso, gemini_response.invoice_date_raw)
 
@@ -248,8 +663,10 @@ def run_invoice_extraction(
         warnings.append("Could not normalize invoice date returned by Gemini")
 
     short_description = sanitize_short_description(gemini_response.short_description, max_words=5)
-    if count_words(short_description) == 0:
+    short_description_words = count_words(short_description)
+    if short_description_words == 0:
         short_description = "item"
+        short_description_words = 1
         warnings.append("Gemini returned an empty short description; defaulted to 'item'")
 
     if gemini_response.notes:
@@ -263,14 +680,15 @@ def run_invoice_extraction(
         filename_date_separator=filename_date_separator,
     )
 
-    result = ExtractionResult(
-        source_file=validated_path.name,
+    # Every field is computed above from already-validated values, so skip re-validation.
+    result = ExtractionResult.model_construct(
+        source_file=prepared.validated_path.name,
         invoice_date=invoice_date,
         invoice_date_raw=invoice_date_raw,
         short_description=short_description,
-        short_description_words=count_words(short_description),
+        short_description_words=short_description_words,
         filename_stub=filename_stub,
-        extraction_method=extraction_method,
+        extraction_method=prepared.extraction_method,
         confidence=max(0.0, min(float(gemini_response.confidence), 1.0)),
         warnings=warnings,
     )
@@ -312,7 +730,11 @@ def perform_rename(source_path: Path, target_path: Path) -> None:
     if source_path == target_path:
         typer.echo(f'File already has target name: "{source_path.name}"')
         return
-    if target_path.exists():
+    try:
+        os.stat(target_path)
+    except FileNotFoundError:
+        pass
+    else:
         raise FileExistsError(
             f'Cannot rename "{source_path.name}" to "{target_path.name}" because destination already exists.'
         )
@@ -342,11 +764,60 @@ def _debug(enabled: bool, message: str) -> None:
 
 
 def _emit_error(message: str, code: int) -> None:
-    payload: dict[str, Any] = {"error": message, "exit_code": code}
-    typer.echo(json.dumps(payload, ensure_ascii=True), err=True)
+    _report_error(message, code)
     raise typer.Exit(code=code)
 
 
+def _report_error(message: str, code: int) -> None:
+    payload: dict[str, Any] = {"error": message, "exit_code": code}
+    typer.echo(_dumps(payload), err=True)
+
+
+def _classify_error(exc: Exception) -> tuple[str, int]:
+    if isinstance(exc, (FileNotFoundError, IsADirectoryError, FileExistsError, ValueError, ConfigError)):
+        return str(exc), EXIT_BAD_INPUT
+    if isinstance(exc, (PasswordProtectedPdfError, PdfIngestError)):
+        return str(exc), EXIT_PDF_ERROR
+    if isinstance(exc, GeminiClientError):
+        return str(exc), EXIT_API_ERROR
+    return f"Unexpected error: {exc}", EXIT_INTERNAL
+
+
+def _dumps(obj: Any, pretty: bool = False) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+
+
+def _dump_results(results: ExtractionResult | list[ExtractionResult]) -> bytes:
+    # pydantic serializes the models to JSON directly, without building dicts first;
+    # the output matches orjson's OPT_INDENT_2 formatting byte for byte.
+    if isinstance(results, list):
+        from pydantic import TypeAdapter
+
+        from .models import ExtractionResult
+
+        data = TypeAdapter(list[ExtractionResult]).dump_json(results, indent=2)
+    else:
+        data = results.model_dump_json(indent=2).encode("utf-8")
+    return data + b"\n"
+
+
+def _write_json(obj: Any) -> None:
+    _write_out(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+
+
+def _write_out(data: bytes) -> None:
+    # JSON goes to stdout as one UTF-8 write, skipping typer.echo's decode/re-encode
+    # round trip.
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        typer.echo(data.decode("utf-8"), nl=False)
+        return
+    # Earlier typer.echo lines may still sit in the text layer; keep them in order.
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
 def main() -> None:
     typer.run(invoice_extract_command)
 
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
-import configparser
 import os
-from dataclasses import dataclass
+import re
+import stat
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable
 
+from .normalize import FILENAME_DATE_SEPARATORS, FILENAME_SEPARATORS, sanitize_filename_suffix
 
 CONFIG_SECTION = "invoice_extract"
 DEFAULT_CONFIG_FILENAME = "invoice-extract.ini"
 LOCAL_CONFIG_FILENAME = "invoice-extract.local.ini"
 
+_SECTION_HEADER_RE = re.compile(r"\[([^\]]+)\]")
+_KEY_VALUE_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*")
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off"})
+_OCR_MODES = frozenset({"auto", "gemini"})
+_IMAGE_FORMATS = frozenset({"jpeg", "png"})
+
 
 class ConfigError(ValueError):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ResolvedCliSettings:
     config_path: Path | None
     gemini_api_key: str | None
@@ -23,6 +36,11 @@ class ResolvedCliSettings:
     locale: str
     max_pages: int
     ocr_mode: str
+    image_format: str
+    render_dpi: int
+    local_extract: bool
+    cache: bool
+    cache_ttl_seconds: int
     dry_run: bool
     rename: bool
     filename_separator: str
@@ -32,6 +50,29 @@ class ResolvedCliSettings:
     debug: bool
 
 
+# Built-in defaults, already valid; resolution only validates the fields something overrides.
+_DEFAULT_SETTINGS = ResolvedCliSettings(
+    config_path=None,
+    gemini_api_key=None,
+    model="gemini-2.0-flash",
+    locale="pl",
+    max_pages=3,
+    ocr_mode="auto",
+    image_format="jpeg",
+    render_dpi=150,
+    local_extract=True,
+    cache=True,
+    cache_ttl_seconds=30 * 24 * 60 * 60,
+    dry_run=False,
+    rename=False,
+    filename_separator="_",
+    filename_suffix="",
+    filename_date_separator="-",
+    timeout_seconds=30,
+    debug=False,
+)
+
+
 def resolve_cli_settings(
     *,
     config_path_override: Path | None = None,
@@ -39,6 +80,11 @@ def resolve_cli_settings(
     locale: str | None = None,
     max_pages: int | None = None,
     ocr_mode: str | None = None,
+    image_format: str | None = None,
+    render_dpi: int | None = None,
+    local_extract: bool | None = None,
+    cache: bool | None = None,
+    cache_ttl_seconds: int | None = None,
     dry_run: bool | None = None,
     rename: bool | None = None,
     filename_separator: str | None = None,
@@ -47,205 +93,283 @@ def resolve_cli_settings(
     timeout_seconds: int | None = None,
     debug: bool | None = None,
 ) -> ResolvedCliSettings:
-    config_paths = _resolve_config_paths(config_path_override)
-    file_values = _read_config_files(config_paths)
-
-    defaults: dict[str, object] = {
-        "gemini_api_key": None,
-        "model": "gemini-2.0-flash",
-        "locale": "pl",
-        "max_pages": 3,
-        "ocr_mode": "auto",
-        "dry_run": False,
-        "rename": False,
-        "filename_separator": "_",
-        "filename_suffix": "",
-        "filename_date_separator": "-",
-        "timeout_seconds": 30,
-        "debug": False,
-    }
-
-    merged: dict[str, object] = defaults.copy()
-    merged.update(file_values)
-    merged.update(_env_overrides())
-
-    cli_overrides: dict[str, object] = {}
+    config_files = _resolve_config_files(config_path_override)
+    file_values = _read_config_files(config_files)
+
+    changed: dict[str, object] = {**file_values, **_env_overrides()}
+
     if model is not None:
-        cli_overrides["model"] = model
+        changed["model"] = model
     if locale is not None:
-        cli_overrides["locale"] = locale
+        changed["locale"] = locale
     if max_pages is not None:
-        cli_overrides["max_pages"] = max_pages
+        changed["max_pages"] = max_pages
     if ocr_mode is not None:
-        cli_overrides["ocr_mode"] = ocr_mode
+        changed["ocr_mode"] = ocr_mode
+    if image_format is not None:
+        changed["image_format"] = image_format
+    if render_dpi is not None:
+        changed["render_dpi"] = render_dpi
+    if local_extract is not None:
+        changed["local_extract"] = local_extract
+    if cache is not None:
+        changed["cache"] = cache
+    if cache_ttl_seconds is not None:
+        changed["cache_ttl_seconds"] = cache_ttl_seconds
     if dry_run is not None:
-        cli_overrides["dry_run"] = dry_run
+        changed["dry_run"] = dry_run
     if rename is not None:
-        cli_overrides["rename"] = rename
+        changed["rename"] = rename
     if filename_separator is not None:
-        cli_overrides["filename_separator"] = filename_separator
+        changed["filename_separator"] = filename_separator
     if filename_suffix is not None:
-        cli_overrides["filename_suffix"] = filename_suffix
+        changed["filename_suffix"] = filename_suffix
     if filename_date_separator is not None:
-        cli_overrides["filename_date_separator"] = filename_date_separator
+        changed["filename_date_separator"] = filename_date_separator
     if timeout_seconds is not None:
-        cli_overrides["timeout_seconds"] = timeout_seconds
+        changed["timeout_seconds"] = timeout_seconds
     if debug is not None:
-        cli_overrides["debug"] = debug
-    merged.update(cli_overrides)
+        changed["debug"] = debug
 
-    normalized = _validate_and_normalize(merged)
-    effective_config_path = config_paths[-1] if config_paths else None
-    return ResolvedCliSettings(config_path=effective_config_path, **normalized)
+    effective_config_path = config_files[-1][0] if config_files else None
+    return _settings_from_changes(changed, effective_config_path)
 
 
-def _resolve_config_paths(config_path_override: Path | None) -> list[Path]:
+def resolve_cli_settings_from_text(text: str, **overrides: object) -> ResolvedCliSettings:
+    # Resolves an INI body without touching disk: the text stands in for the config file and the
+    # keyword overrides for CLI flags, with the usual env layer in between. config_path stays None.
+    unknown = overrides.keys() - _FIELD_NORMALIZERS.keys()
+    if unknown:
+        raise TypeError(f"Unknown setting(s): {', '.join(sorted(unknown))}")
+
+    changed: dict[str, object] = {**_values_from_section(_parse_config_text(text, "<string>")), **_env_overrides()}
+    changed.update((field_name, value) for field_name, value in overrides.items() if value is not None)
+    return _settings_from_changes(changed, None)
+
+
+def _settings_from_changes(changed: dict[str, object], config_path: Path | None) -> ResolvedCliSettings:
+    if not changed and config_path is None:
+        return _DEFAULT_SETTINGS
+    normalized = _validate_and_normalize(changed)
+    return replace(_DEFAULT_SETTINGS, config_path=config_path, **normalized)
+
+
+def _resolve_config_files(config_path_override: Path | None) -> list[tuple[Path, os.stat_result]]:
+    # Each candidate is stat'ed exactly once; the result doubles as the existence check and
+    # the parse-cache fingerprint. (Listing cwd instead would scale with the invoice folder.)
     if config_path_override is not None:
-        return [config_path_override]
+        return [(config_path_override, _stat_required_config(config_path_override))]
 
     env_path = os.getenv("INVOICE_EXTRACT_CONFIG")
     if env_path:
-        return [Path(env_path)]
+        return [(Path(env_path), _stat_required_config(Path(env_path)))]
 
-    config_paths: list[Path] = []
-    default_path = Path.cwd() / DEFAULT_CONFIG_FILENAME
-    local_path = Path.cwd() / LOCAL_CONFIG_FILENAME
-    if default_path.exists():
-        config_paths.append(default_path)
-    if local_path.exists():
-        config_paths.append(local_path)
-    return config_paths
+    cwd = Path.cwd()
+    config_files: list[tuple[Path, os.stat_result]] = []
+    for filename in (DEFAULT_CONFIG_FILENAME, LOCAL_CONFIG_FILENAME):
+        config_path = cwd / filename
+        try:
+            config_files.append((config_path, os.stat(config_path)))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return config_files
 
 
-def _read_config_files(config_paths: list[Path]) -> dict[str, object]:
-    if not config_paths:
+def _stat_required_config(config_path: Path) -> os.stat_result:
+    try:
+        return os.stat(config_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise ConfigError(f"Config file not found: {config_path}") from None
+
+
+def _read_config_files(config_files: list[tuple[Path, os.stat_result]]) -> dict[str, object]:
+    if not config_files:
         return {}
 
-    parser = configparser.ConfigParser()
-    for config_path in config_paths:
-        if not config_path.exists():
-            raise ConfigError(f"Config file not found: {config_path}")
-        if not config_path.is_file():
+    # Files are identified by path + mtime + size, so repeated resolutions in one process
+    # (batch runs, tests) reuse the parsed values until a file actually changes.
+    fingerprints: list[tuple[Path, int, int]] = []
+    for config_path, stat_result in config_files:
+        if not stat.S_ISREG(stat_result.st_mode):
             raise ConfigError(f"Config path is not a file: {config_path}")
+        fingerprints.append((config_path.absolute(), stat_result.st_mtime_ns, stat_result.st_size))
+
+    return dict(_load_config_values(tuple(fingerprints)))
+
 
+@lru_cache(maxsize=16)
+def _load_config_values(fingerprints: tuple[tuple[Path, int, int], ...]) -> dict[str, object]:
+    section: dict[str, str] = {}
+    for config_path, _, _ in fingerprints:
         try:
-            read_files = parser.read(config_path, encoding="utf-8")
-        except configparser.Error as exc:
-            raise ConfigError(f"Failed to parse config file '{config_path}': {exc}") from exc
+            text = config_path.read_text(encoding="utf-8")
+        except OSError:
+            raise ConfigError(f"Failed to read config file: {config_path}") from None
+        section.update(_parse_config_text(text, config_path))
+    return _values_from_section(section)
 
-        if not read_files:
-            raise ConfigError(f"Failed to read config file: {config_path}")
 
-    if not parser.has_section(CONFIG_SECTION):
-        return {}
+def _parse_config_text(text: str, source: Path | str) -> dict[str, str]:
+    section = _parse_simple_ini_section(text)
+    if section is None:
+        section = _parse_ini_section_with_configparser(text, source)
+    return section
+
 
-    section = parser[CONFIG_SECTION]
+def _values_from_section(section: dict[str, str]) -> dict[str, object]:
+    # Both readers hand back values already stripped of surrounding whitespace.
     values: dict[str, object] = {}
+    for field_name, parse in _INI_TABLE:
+        value = section.get(field_name)
+        if value is None:
+            continue
+        if parse is not None:
+            values[field_name] = parse(value, field_name)
+        elif field_name == "gemini_api_key":
+            values[field_name] = value or None
+        else:
+            values[field_name] = value
+    return values
 
-    if "gemini_api_key" in section:
-        api_key = section.get("gemini_api_key", fallback="").strip()
-        values["gemini_api_key"] = api_key or None
-    if "model" in section:
-        values["model"] = section.get("model", fallback="").strip()
-    if "locale" in section:
-        values["locale"] = section.get("locale", fallback="").strip()
-    if "max_pages" in section:
-        values["max_pages"] = _parse_int(section.get("max_pages", fallback=""), "max_pages")
-    if "ocr_mode" in section:
-        values["ocr_mode"] = section.get("ocr_mode", fallback="").strip()
-    if "dry_run" in section:
-        values["dry_run"] = _parse_bool(section.get("dry_run", fallback=""), "dry_run")
-    if "rename" in section:
-        values["rename"] = _parse_bool(section.get("rename", fallback=""), "rename")
-    if "filename_separator" in section:
-        values["filename_separator"] = section.get("filename_separator", fallback="").strip()
-    if "filename_suffix" in section:
-        values["filename_suffix"] = section.get("filename_suffix", fallback="")
-    if "filename_date_separator" in section:
-        values["filename_date_separator"] = section.get("filename_date_separator", fallback="").strip()
-    if "timeout_seconds" in section:
-        values["timeout_seconds"] = _parse_int(section.get("timeout_seconds", fallback=""), "timeout_seconds")
-    if "debug" in section:
-        values["debug"] = _parse_bool(section.get("debug", fallback=""), "debug")
 
+def _parse_simple_ini_section(text: str) -> dict[str, str] | None:
+    # Plain "[section]" / "key = value" files are read with two regexes. Anything configparser
+    # would treat differently (continuation lines, ":" delimiters, "%" interpolation, DEFAULT,
+    # duplicates, keys outside a section) returns None so configparser handles the file instead.
+    values: dict[str, str] = {}
+    sections_seen: set[str] = set()
+    section_keys: set[str] | None = None
+    in_config_section = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace():
+            return None
+        header = _SECTION_HEADER_RE.fullmatch(stripped)
+        if header:
+            name = header.group(1)
+            if name == "DEFAULT" or name in sections_seen:
+                return None
+            sections_seen.add(name)
+            section_keys = set()
+            in_config_section = name == CONFIG_SECTION
+            continue
+        key_value = _KEY_VALUE_RE.fullmatch(stripped)
+        if key_value is None or section_keys is None:
+            return None
+        key = key_value.group(1).lower()
+        if key in section_keys:
+            return None
+        section_keys.add(key)
+        if in_config_section:
+            value = key_value.group(2)
+            if "%" in value:
+                return None
+            values[key] = value
     return values
 
 
+def _parse_ini_section_with_configparser(text: str, source: Path | str) -> dict[str, str]:
+    # Only files the regex reader can't handle pay for importing configparser.
+    import configparser
+
+    parser = configparser.ConfigParser()
+    try:
+        parser.read_string(text, source=str(source))
+        if not parser.has_section(CONFIG_SECTION):
+            return {}
+        return dict(parser[CONFIG_SECTION])
+    except configparser.Error as exc:
+        raise ConfigError(f"Failed to parse config file '{source}': {exc}") from exc
+
+
 def _env_overrides() -> dict[str, object]:
+    # One lookup per variable: os.environ re-encodes the key on every access.
     env = os.environ
     values: dict[str, object] = {}
-
-    if env.get("INVOICE_EXTRACT_GEMINI_API_KEY") is not None:
-        values["gemini_api_key"] = env.get("INVOICE_EXTRACT_GEMINI_API_KEY") or None
-
-    if env.get("INVOICE_EXTRACT_MODEL") is not None:
-        values["model"] = env["INVOICE_EXTRACT_MODEL"]
-    if env.get("INVOICE_EXTRACT_LOCALE") is not None:
-        values["locale"] = env["INVOICE_EXTRACT_LOCALE"]
-    if env.get("INVOICE_EXTRACT_MAX_PAGES") is not None:
-        values["max_pages"] = _parse_int(env["INVOICE_EXTRACT_MAX_PAGES"], "INVOICE_EXTRACT_MAX_PAGES")
-    if env.get("INVOICE_EXTRACT_OCR_MODE") is not None:
-        values["ocr_mode"] = env["INVOICE_EXTRACT_OCR_MODE"]
-    if env.get("INVOICE_EXTRACT_DRY_RUN") is not None:
-        values["dry_run"] = _parse_bool(env["INVOICE_EXTRACT_DRY_RUN"], "INVOICE_EXTRACT_DRY_RUN")
-    if env.get("INVOICE_EXTRACT_RENAME") is not None:
-        values["rename"] = _parse_bool(env["INVOICE_EXTRACT_RENAME"], "INVOICE_EXTRACT_RENAME")
-    if env.get("INVOICE_EXTRACT_FILENAME_SEPARATOR") is not None:
-        values["filename_separator"] = env["INVOICE_EXTRACT_FILENAME_SEPARATOR"]
-    if env.get("INVOICE_EXTRACT_FILENAME_SUFFIX") is not None:
-        values["filename_suffix"] = env["INVOICE_EXTRACT_FILENAME_SUFFIX"]
-    if env.get("INVOICE_EXTRACT_FILENAME_DATE_SEPARATOR") is not None:
-        values["filename_date_separator"] = env["INVOICE_EXTRACT_FILENAME_DATE_SEPARATOR"]
-    if env.get("INVOICE_EXTRACT_TIMEOUT_SECONDS") is not None:
-        values["timeout_seconds"] = _parse_int(
-            env["INVOICE_EXTRACT_TIMEOUT_SECONDS"],
-            "INVOICE_EXTRACT_TIMEOUT_SECONDS",
-        )
-    if env.get("INVOICE_EXTRACT_DEBUG") is not None:
-        values["debug"] = _parse_bool(env["INVOICE_EXTRACT_DEBUG"], "INVOICE_EXTRACT_DEBUG")
-
+    for env_name, field_name, parse in _ENV_TABLE:
+        value = env.get(env_name)
+        if value is None:
+            continue
+        if parse is not None:
+            values[field_name] = parse(value, env_name)
+        elif field_name == "gemini_api_key":
+            values[field_name] = value or None
+        else:
+            values[field_name] = value
     return values
 
 
 def _validate_and_normalize(values: dict[str, object]) -> dict[str, object]:
-    model = str(values.get("model", "")).strip()
+    return {key: _FIELD_NORMALIZERS[key](value) for key, value in values.items()}
+
+
+def _as_int(value: object) -> int:
+    # File and env values arrive already parsed and CLI values typed, so this is rarely a conversion.
+    return value if type(value) is int else int(str(value).strip())
+
+
+def _as_bool(value: object) -> bool:
+    return value if type(value) is bool else bool(value)
+
+
+# Closed-set values are interned so they share identity with the literals they are compared
+# against and used as cache keys with (e.g. "auto", "jpeg", "pl").
+def _normalize_model(value: object) -> str:
+    model = str(value).strip()
     if not model:
         raise ConfigError("model must not be empty")
+    return sys.intern(model)
 
-    locale = str(values.get("locale", "")).strip().lower()
+
+def _normalize_locale(value: object) -> str:
+    locale = str(value).strip().lower()
     if not locale:
         raise ConfigError("locale must not be empty")
+    return sys.intern(locale)
+
 
-    max_pages = int(values.get("max_pages", 0))
+def _normalize_max_pages(value: object) -> int:
+    max_pages = _as_int(value)
     if max_pages < 1:
         raise ConfigError("max_pages must be >= 1")
+    return max_pages
+
 
-    ocr_mode = str(values.get("ocr_mode", "")).strip().lower()
-    if ocr_mode not in {"auto", "gemini"}:
+def _normalize_ocr_mode(value: object) -> str:
+    ocr_mode = str(value).strip().lower()
+    if ocr_mode not in _OCR_MODES:
         raise ConfigError("ocr_mode must be 'auto' or 'gemini'")
+    return sys.intern(ocr_mode)
+
+
+def _normalize_image_format(value: object) -> str:
+    image_format = str(value).strip().lower()
+    if image_format not in _IMAGE_FORMATS:
+        raise ConfigError("image_format must be 'jpeg' or 'png'")
+    return sys.intern(image_format)
+
 
-    filename_separator = _normalize_filename_separator(values.get("filename_separator", "_"))
-    filename_date_separator = _normalize_filename_date_separator(values.get("filename_date_separator", "-"))
-    filename_suffix = _normalize_filename_suffix(values.get("filename_suffix", ""))
+def _normalize_render_dpi(value: object) -> int:
+    render_dpi = _as_int(value)
+    if render_dpi < 72:
+        raise ConfigError("render_dpi must be >= 72")
+    return render_dpi
 
-    timeout_seconds = int(values.get("timeout_seconds", 0))
+
+def _normalize_cache_ttl_seconds(value: object) -> int:
+    cache_ttl_seconds = _as_int(value)
+    if cache_ttl_seconds < 1:
+        raise ConfigError("cache_ttl_seconds must be >= 1")
+    return cache_ttl_seconds
+
+
+def _normalize_timeout_seconds(value: object) -> int:
+    timeout_seconds = _as_int(value)
     if timeout_seconds < 1:
         raise ConfigError("timeout_seconds must be >= 1")
-
-    return {
-        "gemini_api_key": _optional_str(values.get("gemini_api_key")),
-        "model": model,
-        "locale": locale,
-        "max_pages": max_pages,
-        "ocr_mode": ocr_mode,
-        "dry_run": bool(values.get("dry_run", False)),
-        "rename": bool(values.get("rename", False)),
-        "filename_separator": filename_separator,
-        "filename_suffix": filename_suffix,
-        "filename_date_separator": filename_date_separator,
-        "timeout_seconds": timeout_seconds,
-        "debug": bool(values.get("debug", False)),
-    }
+    return timeout_seconds
 
 
 def _optional_str(value: object) -> str | None:
@@ -257,9 +381,9 @@ def _optional_str(value: object) -> str | None:
 
 def _parse_bool(value: str, field_name: str) -> bool:
     lowered = value.strip().lower()
-    if lowered in {"1", "true", "yes", "on"}:
+    if lowered in _TRUE_VALUES:
         return True
-    if lowered in {"0", "false", "no", "off"}:
+    if lowered in _FALSE_VALUES:
         return False
     raise ConfigError(f"Invalid boolean for {field_name}: {value!r}")
 
@@ -275,40 +399,63 @@ def _normalize_filename_separator(value: object) -> str:
     text = str(value)
     if text == " ":
         return " "
-    raw = text.strip().lower()
-    mapping = {
-        "underscore": "_",
-        "_": "_",
-        "dash": "-",
-        "hyphen": "-",
-        "-": "-",
-        "space": " ",
-        " ": " ",
-    }
-    if raw not in mapping:
+    separator = FILENAME_SEPARATORS.get(text.strip().lower())
+    if separator is None:
         raise ConfigError("filename_separator must be one of: underscore, dash, space, _, -")
-    return mapping[raw]
+    return separator
 
 
 def _normalize_filename_date_separator(value: object) -> str:
-    raw = str(value).strip().lower()
-    mapping = {
-        "dash": "-",
-        "hyphen": "-",
-        "-": "-",
-        "dot": ".",
-        ".": ".",
-        "underscore": "_",
-        "_": "_",
-    }
-    if raw not in mapping:
+    separator = FILENAME_DATE_SEPARATORS.get(str(value).strip().lower())
+    if separator is None:
         raise ConfigError("filename_date_separator must be one of: dash, dot, underscore, -, ., _")
-    return mapping[raw]
+    return separator
 
 
 def _normalize_filename_suffix(value: object) -> str:
-    text = str(value)
-    cleaned = text.strip()
-    cleaned = cleaned.replace("/", "-").replace("\\", "-")
-    cleaned = "".join(ch for ch in cleaned if ch >= " " and ch != "\x7f")
-    return cleaned
+    return sanitize_filename_suffix(str(value))
+
+
+_FIELD_NORMALIZERS: dict[str, Callable[[object], object]] = {
+    "gemini_api_key": _optional_str,
+    "model": _normalize_model,
+    "locale": _normalize_locale,
+    "max_pages": _normalize_max_pages,
+    "ocr_mode": _normalize_ocr_mode,
+    "image_format": _normalize_image_format,
+    "render_dpi": _normalize_render_dpi,
+    "local_extract": _as_bool,
+    "cache": _as_bool,
+    "cache_ttl_seconds": _normalize_cache_ttl_seconds,
+    "dry_run": _as_bool,
+    "rename": _as_bool,
+    "filename_separator": _normalize_filename_separator,
+    "filename_suffix": _normalize_filename_suffix,
+    "filename_date_separator": _normalize_filename_date_separator,
+    "timeout_seconds": _normalize_timeout_seconds,
+    "debug": _as_bool,
+}
+
+_ENV_TABLE: tuple[tuple[str, str, Callable[[str, str], object] | None], ...] = (
+    ("INVOICE_EXTRACT_GEMINI_API_KEY", "gemini_api_key", None),
+    ("INVOICE_EXTRACT_MODEL", "model", None),
+    ("INVOICE_EXTRACT_LOCALE", "locale", None),
+    ("INVOICE_EXTRACT_MAX_PAGES", "max_pages", _parse_int),
+    ("INVOICE_EXTRACT_OCR_MODE", "ocr_mode", None),
+    ("INVOICE_EXTRACT_IMAGE_FORMAT", "image_format", None),
+    ("INVOICE_EXTRACT_RENDER_DPI", "render_dpi", _parse_int),
+    ("INVOICE_EXTRACT_LOCAL_EXTRACT", "local_extract", _parse_bool),
+    ("INVOICE_EXTRACT_CACHE", "cache", _parse_bool),
+    ("INVOICE_EXTRACT_CACHE_TTL_SECONDS", "cache_ttl_seconds", _parse_int),
+    ("INVOICE_EXTRACT_DRY_RUN", "dry_run", _parse_bool),
+    ("INVOICE_EXTRACT_RENAME", "rename", _parse_bool),
+    ("INVOICE_EXTRACT_FILENAME_SEPARATOR", "filename_separator", None),
+    ("INVOICE_EXTRACT_FILENAME_SUFFIX", "filename_suffix", None),
+    ("INVOICE_EXTRACT_FILENAME_DATE_SEPARATOR", "filename_date_separator", None),
+    ("INVOICE_EXTRACT_TIMEOUT_SECONDS", "timeout_seconds", _parse_int),
+    ("INVOICE_EXTRACT_DEBUG", "debug", _parse_bool),
+)
+# INI keys match the settings field names and share the env parsers.
+_INI_TABLE: tuple[tuple[str, Callable[[str, str], object] | None], ...] = tuple(
+    (field_name, parse) for _, field_name, parse in _ENV_TABLE
+)
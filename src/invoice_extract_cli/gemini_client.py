@@ -1,18 +1,38 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import re
-from typing import Any
+from dataclasses import dataclass
+from functools import lru_cache, singledispatch
+from typing import TYPE_CHECKING, Any, Iterable
 
-from pydantic import ValidationError
+if TYPE_CHECKING:
+    from pydantic import ValidationError
 
-from .models import GeminiResponseSchema
+    from .cache import ResponseCache
+    from .models import GeminiResponseSchema
 
 
 class GeminiClientError(RuntimeError):
     pass
 
 
+# One SDK client per API key for the whole process, so every extractor reuses the
+# same underlying HTTP connection pool instead of paying a fresh TCP/TLS handshake.
+_SHARED_CLIENTS: dict[str, tuple[Any, Any]] = {}
+
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class ExtractionPayload:
+    """One extraction request for GeminiInvoiceExtractor.extract_many."""
+
+    text: str | None = None
+    images: list[bytes] | None = None
+    mime_type: str = "image/png"
+
+
 class GeminiInvoiceExtractor:
     def __init__(
         self,
@@ -20,11 +40,13 @@ class GeminiInvoiceExtractor:
         model: str = "gemini-2.0-flash",
         timeout_seconds: int = 30,
         locale: str = "pl",
+        response_cache: ResponseCache | None = None,
     ):
         self.api_key = api_key
         self.model = model
         self.timeout_seconds = timeout_seconds
         self.locale = (locale or "pl").strip().lower()
+        self.response_cache = response_cache
         self._client: Any | None = None
         self._types: Any | None = None
 
@@ -32,31 +54,132 @@ class GeminiInvoiceExtractor:
             raise GeminiClientError("INVOICE_EXTRACT_GEMINI_API_KEY is not set")
 
     def extract_from_text(self, text: str) -> GeminiResponseSchema:
-        clipped_text = text[:60000]
-        payload = f"{build_text_prompt(self.locale)}\n\nINVOICE_TEXT_START\n{clipped_text}\nINVOICE_TEXT_END\n"
-        response_text = self._generate_content([payload])
-        return parse_gemini_response_text(response_text)
+        return self.extract(text=text)
+
+    def extract_from_images(self, images: list[bytes], mime_type: str = "image/png") -> GeminiResponseSchema:
+        return self.extract(images=images, mime_type=mime_type)
+
+    def extract_from_text_and_images(
+        self,
+        text: str,
+        images: list[bytes],
+        mime_type: str = "image/png",
+    ) -> GeminiResponseSchema:
+        return self.extract(text=text, images=images, mime_type=mime_type)
+
+    def extract(
+        self,
+        *,
+        text: str | None = None,
+        images: list[bytes] | None = None,
+        mime_type: str = "image/png",
+    ) -> GeminiResponseSchema:
+        cache_key = self._cache_key(text, images, mime_type)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+        contents = self._build_contents(text, images, mime_type)
+        response = parse_gemini_response_text(self._generate_content(contents))
+        self._store_response(cache_key, response)
+        return response
+
+    async def extract_async(
+        self,
+        *,
+        text: str | None = None,
+        images: list[bytes] | None = None,
+        mime_type: str = "image/png",
+    ) -> GeminiResponseSchema:
+        cache_key = self._cache_key(text, images, mime_type)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+        contents = self._build_contents(text, images, mime_type)
+        response = parse_gemini_response_text(await self._generate_content_async(contents))
+        self._store_response(cache_key, response)
+        return response
+
+    async def extract_many(
+        self,
+        payloads: Iterable[ExtractionPayload],
+        *,
+        concurrency: int = 16,
+    ) -> list[GeminiResponseSchema | GeminiClientError]:
+        # Requests run concurrently (at most `concurrency` in flight); results keep the payload
+        # order, and a failed request yields its GeminiClientError in place instead of raising.
+        import asyncio
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(payload: ExtractionPayload) -> GeminiResponseSchema | GeminiClientError:
+            async with semaphore:
+                try:
+                    return await self.extract_async(
+                        text=payload.text,
+                        images=payload.images,
+                        mime_type=payload.mime_type,
+                    )
+                except GeminiClientError as exc:
+                    return exc
+
+        return list(await asyncio.gather(*(run(payload) for payload in payloads)))
+
+    def _cache_key(self, text: str | None, images: list[bytes] | None, mime_type: str) -> str | None:
+        # Everything that shapes the request (model, prompt language, text, page images) is part
+        # of the key; each piece is hashed separately so boundaries between them can't blur.
+        if self.response_cache is None:
+            return None
+        digest = hashlib.sha256()
+        for piece in (self.model, self.locale, "text" if text is not None else "", text or ""):
+            digest.update(hashlib.sha256(piece.encode("utf-8")).digest())
+        if images is not None:
+            digest.update(hashlib.sha256(mime_type.encode("utf-8")).digest())
+            for image in images:
+                digest.update(hashlib.sha256(image).digest())
+        return digest.hexdigest()
+
+    def _cached_response(self, cache_key: str | None) -> GeminiResponseSchema | None:
+        if cache_key is None or self.response_cache is None:
+            return None
+        payload = self.response_cache.get(cache_key)
+        if payload is None:
+            return None
+        try:
+            return parse_gemini_response_text(payload)
+        except GeminiClientError:
+            return None
+
+    def _store_response(self, cache_key: str | None, response: GeminiResponseSchema) -> None:
+        if cache_key is not None and self.response_cache is not None:
+            self.response_cache.put(cache_key, response.model_dump_json())
+
+    def _build_contents(self, text: str | None, images: list[bytes] | None, mime_type: str) -> list[Any]:
+        if images is None:
+            if text is None:
+                raise GeminiClientError("Nothing to extract: provide invoice text and/or page images")
+            return [_wrap_invoice_text(build_text_prompt(self.locale), text)]
 
-    def extract_from_images(self, images: list[bytes]) -> GeminiResponseSchema:
         if not images:
             raise GeminiClientError("No images were provided for Gemini vision extraction")
 
-        client, types = self._ensure_client()
+        _, types = self._ensure_client()
         if types is None or not hasattr(types, "Part"):
             raise GeminiClientError("Installed google-genai SDK does not support image parts API")
 
-        image_parts = [types.Part.from_bytes(data=img, mime_type="image/png") for img in images]
-        response_text = self._generate_content(
-            [build_vision_prompt(self.locale), *image_parts],
-            client=client,
-            types=types,
-        )
-        return parse_gemini_response_text(response_text)
+        image_parts = [types.Part.from_bytes(data=img, mime_type=mime_type) for img in images]
+        if text is None:
+            return [build_vision_prompt(self.locale), *image_parts]
+        return [_wrap_invoice_text(build_hybrid_prompt(self.locale), text), *image_parts]
 
     def _ensure_client(self) -> tuple[Any, Any]:
         if self._client is not None:
             return self._client, self._types
 
+        shared = _SHARED_CLIENTS.get(self.api_key or "")
+        if shared is not None:
+            self._client, self._types = shared
+            return shared
+
         try:
             from google import genai  # type: ignore
         except ImportError as exc:  # pragma: no cover - environment-specific
@@ -66,37 +189,65 @@ class GeminiInvoiceExtractor:
 
         types = getattr(genai, "types", None)
         try:
-            client = genai.Client(api_key=self.api_key)
+            http_options = _http_options()
+            try:
+                client = genai.Client(api_key=self.api_key, http_options=http_options)
+            except (TypeError, ValueError):
+                # Older SDKs don't accept httpx client arguments; their default pool still works.
+                client = genai.Client(api_key=self.api_key)
         except Exception as exc:  # pragma: no cover - network/auth setup specific
             raise GeminiClientError(f"Failed to initialize Gemini client: {exc}") from exc
 
         self._client = client
         self._types = types
+        _SHARED_CLIENTS[self.api_key or ""] = (client, types)
         return client, types
 
-    def _generate_content(self, contents: list[Any], client: Any | None = None, types: Any | None = None) -> str:
-        client = client or self._ensure_client()[0]
-        if types is None:
-            _, types = self._ensure_client()
+    def _generate_content(self, contents: list[Any]) -> str:
+        client, types = self._ensure_client()
+        kwargs = self._request_kwargs(contents, types)
+
+        try:
+            if hasattr(client.models, "generate_content_stream"):
+                text = _read_stream_until_json_complete(client.models.generate_content_stream(**kwargs))
+            else:
+                text = _response_to_text(client.models.generate_content(**kwargs))
+        except Exception as exc:  # pragma: no cover - network/API-specific
+            raise GeminiClientError(f"Gemini API request failed: {exc}") from exc
 
-        config = self._build_config(types)
+        if not text or not text.strip():
+            raise GeminiClientError("Gemini returned an empty response")
+        return text
+
+    async def _generate_content_async(self, contents: list[Any]) -> str:
+        client, types = self._ensure_client()
+        aio_models = getattr(getattr(client, "aio", None), "models", None)
+        if aio_models is None or not hasattr(aio_models, "generate_content_stream"):
+            import asyncio
+
+            return await asyncio.to_thread(self._generate_content, contents)
 
+        kwargs = self._request_kwargs(contents, types)
         try:
-            kwargs: dict[str, Any] = {
-                "model": self.model,
-                "contents": contents,
-            }
-            if config is not None:
-                kwargs["config"] = config
-            response = client.models.generate_content(**kwargs)
+            stream = await aio_models.generate_content_stream(**kwargs)
+            text = await _read_async_stream_until_json_complete(stream)
         except Exception as exc:  # pragma: no cover - network/API-specific
             raise GeminiClientError(f"Gemini API request failed: {exc}") from exc
 
-        text = _response_to_text(response)
-        if not text:
+        if not text or not text.strip():
             raise GeminiClientError("Gemini returned an empty response")
         return text
 
+    def _request_kwargs(self, contents: list[Any], types: Any | None) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {
+            "model": self.model,
+            "contents": contents,
+        }
+        config = self._build_config(types)
+        if config is not None:
+            kwargs["config"] = config
+        return kwargs
+
     def list_models(
         self,
         *,
@@ -150,18 +301,46 @@ class GeminiInvoiceExtractor:
             return None
 
 
+def _http_options() -> dict[str, Any] | None:
+    # httpx drops idle connections after 5 s by default; a batch keeps its connections across
+    # the gaps while PDFs are prepared, so later requests skip the TCP/TLS handshake.
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - httpx ships with google-genai
+        return None
+    limits = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+    return {"client_args": {"limits": limits}, "async_client_args": {"limits": limits}}
+
+
 def parse_gemini_response_text(response_text: str) -> GeminiResponseSchema:
+    # pydantic is imported here so that importing this module (e.g. for --help) stays cheap.
+    from pydantic import ValidationError
+
+    from .models import GeminiResponseSchema
+
+    # Requests ask for application/json, so the response normally parses and validates as-is in
+    # pydantic-core; the fence/brace scan is only needed when the model wraps the object in prose
+    # or a code block.
     try:
-        payload = json.loads(extract_json_object(response_text))
-    except json.JSONDecodeError as exc:
-        raise GeminiClientError(f"Gemini did not return valid JSON: {exc}") from exc
+        return GeminiResponseSchema.model_validate_json(response_text)
+    except ValidationError as exc:
+        if not _is_not_a_json_object(exc):
+            raise GeminiClientError(f"Gemini response schema validation failed: {exc}") from exc
 
     try:
-        return GeminiResponseSchema.model_validate(payload)
+        return GeminiResponseSchema.model_validate_json(extract_json_object(response_text))
     except ValidationError as exc:
+        if _is_not_a_json_object(exc):
+            raise GeminiClientError(f"Gemini did not return valid JSON: {exc}") from exc
         raise GeminiClientError(f"Gemini response schema validation failed: {exc}") from exc
 
 
+def _is_not_a_json_object(exc: ValidationError) -> bool:
+    return any(error["type"] in ("json_invalid", "model_type") and not error["loc"] for error in exc.errors())
+
+
+# Prompts depend only on the locale, so each one is built once per process and then reused.
+@lru_cache(maxsize=8)
 def build_text_prompt(locale: str = "pl") -> str:
     return _build_prompt(
         "Extract invoice metadata from the provided invoice text.",
@@ -169,6 +348,7 @@ def build_text_prompt(locale: str = "pl") -> str:
     )
 
 
+@lru_cache(maxsize=8)
 def build_vision_prompt(locale: str = "pl") -> str:
     return _build_prompt(
         "Extract invoice metadata from the provided invoice page images (OCR and interpret).",
@@ -176,6 +356,15 @@ def build_vision_prompt(locale: str = "pl") -> str:
     )
 
 
+@lru_cache(maxsize=8)
+def build_hybrid_prompt(locale: str = "pl") -> str:
+    return _build_prompt(
+        "Extract invoice metadata from the provided invoice text and first page image. "
+        "The text may be incomplete or garbled; use the image to confirm or correct it.",
+        locale=locale,
+    )
+
+
 def _build_prompt(task_intro: str, *, locale: str) -> str:
     language_rule = _language_rule(locale)
     return f"""{task_intro}
@@ -210,7 +399,7 @@ def _language_rule(locale: str) -> str:
 def extract_json_object(text: str) -> str:
     stripped = text.strip()
 
-    fenced_match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", stripped, flags=re.DOTALL)
+    fenced_match = _FENCED_JSON_RE.search(stripped)
     if fenced_match:
         return fenced_match.group(1)
 
@@ -222,6 +411,105 @@ def extract_json_object(text: str) -> str:
     return stripped[start : end + 1]
 
 
+def _wrap_invoice_text(prompt: str, text: str) -> str:
+    clipped_text = text[:60000]
+    return f"{prompt}\n\nINVOICE_TEXT_START\n{clipped_text}\nINVOICE_TEXT_END\n"
+
+
+def _read_stream_until_json_complete(stream: Any) -> str:
+    # The answer is a single JSON object; once its closing brace arrives, anything the
+    # model still sends (trailing fence, whitespace) is irrelevant, so stop reading.
+    tracker = JsonObjectTracker()
+    pieces: list[str] = []
+    try:
+        for chunk in stream:
+            text = _chunk_to_text(chunk)
+            if not text:
+                continue
+            pieces.append(text)
+            if tracker.feed(text):
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
+    return "".join(pieces)
+
+
+async def _read_async_stream_until_json_complete(stream: Any) -> str:
+    tracker = JsonObjectTracker()
+    pieces: list[str] = []
+    try:
+        async for chunk in stream:
+            text = _chunk_to_text(chunk)
+            if not text:
+                continue
+            pieces.append(text)
+            if tracker.feed(text):
+                break
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if callable(aclose):
+            await aclose()
+    return "".join(pieces)
+
+
+class JsonObjectTracker:
+    """Incrementally tracks brace depth to detect when the first JSON object is complete."""
+
+    def __init__(self) -> None:
+        self.started = False
+        self.complete = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        if self.complete:
+            return True
+        for ch in text:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == "{":
+                self.started = True
+                self._depth += 1
+            elif not self.started:
+                continue
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+                    return True
+        return False
+
+
+def _chunk_to_text(chunk: Any) -> str:
+    # Unlike _response_to_text, whitespace-only pieces are kept: mid-stream they can be
+    # part of a JSON string value.
+    try:
+        text = getattr(chunk, "text", None)
+    except Exception:  # pragma: no cover - SDK-specific accessor errors
+        text = None
+    if isinstance(text, str):
+        return text
+
+    pieces: list[str] = []
+    for candidate in getattr(chunk, "candidates", None) or []:
+        content = getattr(candidate, "content", None)
+        for part in getattr(content, "parts", None) or []:
+            part_text = getattr(part, "text", None)
+            if isinstance(part_text, str):
+                pieces.append(part_text)
+    return "".join(pieces)
+
+
 def _response_to_text(response: Any) -> str | None:
     text = getattr(response, "text", None)
     if isinstance(text, str) and text.strip():
@@ -324,15 +612,9 @@ def _string_list_or_none(value: Any) -> list[str] | None:
     return [str(value)]
 
 
+# Dispatches on the value's type (cached per class) instead of a chain of isinstance checks per node.
+@singledispatch
 def _jsonable(value: Any) -> Any:
-    if value is None:
-        return None
-    if isinstance(value, (str, int, float, bool)):
-        return value
-    if isinstance(value, dict):
-        return {str(k): _jsonable(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple, set)):
-        return [_jsonable(v) for v in value]
     if hasattr(value, "model_dump"):
         try:
             return _jsonable(value.model_dump())
@@ -344,3 +626,23 @@ def _jsonable(value: Any) -> Any:
         except Exception:
             pass
     return str(value)
+
+
+@_jsonable.register(type(None))
+@_jsonable.register(str)
+@_jsonable.register(int)
+@_jsonable.register(float)
+def _jsonable_scalar(value: Any) -> Any:
+    return value
+
+
+@_jsonable.register(dict)
+def _jsonable_dict(value: dict) -> dict[str, Any]:
+    return {str(k): _jsonable(v) for k, v in value.items()}
+
+
+@_jsonable.register(list)
+@_jsonable.register(tuple)
+@_jsonable.register(set)
+def _jsonable_sequence(value: Any) -> list[Any]:
+    return [_jsonable(v) for v in value]
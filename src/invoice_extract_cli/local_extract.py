@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from .normalize import normalize_date
+
+if TYPE_CHECKING:
+    from .models import GeminiResponseSchema
+
+# Local answers skip Gemini's judgement entirely, so they are reported with modest confidence.
+LOCAL_EXTRACT_CONFIDENCE = 0.6
+
+_NUMERIC_DAY_FIRST_RE = re.compile(r"(\d{1,2})[./-](\d{1,2})[./-](\d{4})")
+
+_ISSUE_DATE_RES = {
+    "pl": re.compile(
+        r"data\s+(?:wystawienia|faktury)\s*:?\s*(\d{4}-\d{2}-\d{2}|\d{1,2}[./-]\d{1,2}[./-]\d{4})",
+        re.IGNORECASE,
+    ),
+    # Day/month order is ambiguous in English numeric dates, so only ISO and spelled-out months count.
+    "en": re.compile(
+        r"(?:invoice\s+date|date\s+of\s+issue|issue\s+date)\s*:?\s*"
+        r"(\d{4}-\d{2}-\d{2}|\d{1,2} [A-Za-z]{3,9},? \d{4}|[A-Za-z]{3,9} \d{1,2},? \d{4})",
+        re.IGNORECASE,
+    ),
+}
+
+_ITEM_HEADER_RES = {
+    # A bare "Nazwa:" usually labels the seller, so the item column must be named explicitly.
+    "pl": re.compile(r"^(?:lp\.?\s+)?nazwa\s+(?:towaru|usługi|produktu)\b(?!\s*:)", re.IGNORECASE),
+    "en": re.compile(r"^(?:no\.?\s+)?(?:item\s+)?description\b(?!\s*:)", re.IGNORECASE),
+}
+
+# Column headers that typically follow the item-name header when each table cell is its own line.
+_COLUMN_HEADER_WORDS = frozenset(
+    {
+        "lp",
+        "ilość",
+        "ilosc",
+        "j.m.",
+        "jm",
+        "cena",
+        "wartość",
+        "wartosc",
+        "netto",
+        "brutto",
+        "vat",
+        "stawka",
+        "kwota",
+        "pkwiu",
+        "szt",
+        "szt.",
+        "kpl",
+        "qty",
+        "quantity",
+        "unit",
+        "price",
+        "amount",
+        "total",
+        "tax",
+        "rate",
+        "pcs",
+    }
+)
+_COLUMN_GAP_RE = re.compile(r"\s{2,}|\t")
+_AMOUNT_RE = re.compile(r"\d[\d ]*[.,]\d{2}\b")
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+
+_MAX_LINES_AFTER_HEADER = 12
+
+
+def try_local_extract(text: str, locale: str = "pl") -> GeminiResponseSchema | None:
+    # Only a labelled issue date plus the first line item under a recognised table header
+    # count, and only in the requested description language; anything else goes to Gemini.
+    language = (locale or "pl").strip().lower()[:2]
+    date_re = _ISSUE_DATE_RES.get(language)
+    header_re = _ITEM_HEADER_RES.get(language)
+    if date_re is None or header_re is None:
+        return None
+
+    date_match = date_re.search(text)
+    if date_match is None:
+        return None
+    invoice_date_raw = date_match.group(1)
+    invoice_date_iso = _parse_issue_date(invoice_date_raw)
+    if invoice_date_iso is None:
+        return None
+
+    description = _first_item_description(text, header_re)
+    if description is None:
+        return None
+
+    from .models import GeminiResponseSchema
+
+    return GeminiResponseSchema(
+        invoice_date_raw=invoice_date_raw,
+        invoice_date_iso=invoice_date_iso,
+        short_description=description,
+        confidence=LOCAL_EXTRACT_CONFIDENCE,
+    )
+
+
+def _parse_issue_date(value: str) -> str | None:
+    day_first = _NUMERIC_DAY_FIRST_RE.fullmatch(value)
+    if day_first:
+        day, month, year = day_first.groups()
+        value = f"{year}-{int(month):02d}-{int(day):02d}"
+    return normalize_date(value)
+
+
+def _first_item_description(text: str, header_re: re.Pattern[str]) -> str | None:
+    lines = [line.strip() for line in text.splitlines()]
+    for index, line in enumerate(lines):
+        if not header_re.match(line):
+            continue
+        for candidate in lines[index + 1 : index + 1 + _MAX_LINES_AFTER_HEADER]:
+            description = _description_from_line(candidate)
+            if description:
+                return description
+        return None
+    return None
+
+
+def _description_from_line(line: str) -> str | None:
+    if not line or line.lower().rstrip(":") in _COLUMN_HEADER_WORDS:
+        return None
+    cell = _COLUMN_GAP_RE.split(line, maxsplit=1)[0]
+    amount = _AMOUNT_RE.search(cell)
+    if amount:
+        cell = cell[: amount.start()]
+    cell = cell.lstrip("0123456789.) ").strip(" -–—:;,")
+    if not _WORD_RE.search(cell):
+        return None
+    words = cell.split()
+    if words and words[0].lower() in _COLUMN_HEADER_WORDS:
+        return None
+    return " ".join(words[:5])
@@ -5,7 +5,7 @@ from typing import Literal
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
-ExtractionMethod = Literal["pdf_text", "gemini_vision"]
+ExtractionMethod = Literal["local_regex", "pdf_text", "hybrid", "gemini_vision"]
 
 
 class PagePayload(BaseModel):
@@ -3,23 +3,17 @@ from __future__ import annotations
 import re
 import unicodedata
 from datetime import datetime
-
-_COMMON_DATE_FORMATS = (
-    "%Y-%m-%d",
-    "%Y/%m/%d",
-    "%Y.%m.%d",
-    "%d %b %Y",
-    "%d %B %Y",
-    "%b %d %Y",
-    "%B %d %Y",
-    "%d-%b-%Y",
-    "%d-%B-%Y",
-    "%b %d, %Y",
-    "%B %d, %Y",
-    "%d/%m/%Y",
-    "%m/%d/%Y",
-    "%d-%m-%Y",
-    "%m-%d-%Y",
+from functools import lru_cache
+
+# Each accepted date shape maps to the only strptime formats that could match it, so a value
+# costs one regex match and at most four parse attempts instead of a sweep over every format.
+_YEAR_FIRST_DATE_RE = re.compile(r"(\d{4})([-/.])(\d{1,2})\2(\d{1,2})")
+_YEAR_LAST_DATE_RE = re.compile(r"(\d{1,2})([/-])(\d{1,2})\2(\d{4})")
+_MONTH_NAME_DATE_FORMATS = (
+    (re.compile(r"\d{1,2} [A-Za-z]+ \d{4}"), ("%d %b %Y", "%d %B %Y")),
+    (re.compile(r"\d{1,2}-[A-Za-z]+-\d{4}"), ("%d-%b-%Y", "%d-%B-%Y")),
+    (re.compile(r"[A-Za-z]+ \d{1,2} \d{4}"), ("%b %d %Y", "%B %d %Y")),
+    (re.compile(r"[A-Za-z]+ \d{1,2}, \d{4}"), ("%b %d, %Y", "%B %d, %Y")),
 )
 
 _POLISH_TRANSLITERATION = str.maketrans(
@@ -45,7 +39,43 @@ _POLISH_TRANSLITERATION = str.maketrans(
     }
 )
 
+_NUMERIC_DATE_RE = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})")
+_EMBEDDED_DATE_RE = re.compile(
+    r"\b(\d{4}-\d{2}-\d{2}|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|[A-Za-z]{3,9} \d{1,2}, \d{4}|\d{1,2} [A-Za-z]{3,9} \d{4})\b"
+)
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Folded descriptions are almost always ASCII, where one translate does the _NON_ALNUM_RE substitution.
+_ASCII_NON_ALNUM_TRANSLATION = str.maketrans(
+    {chr(code): " " for code in range(0x80) if not ("a" <= chr(code) <= "z" or "0" <= chr(code) <= "9")}
+)
+
+# Accepted separator spellings; config validation rejects anything else, filename building falls back.
+FILENAME_SEPARATORS = {
+    "underscore": "_",
+    "_": "_",
+    "dash": "-",
+    "hyphen": "-",
+    "-": "-",
+    "space": " ",
+    " ": " ",
+}
+FILENAME_DATE_SEPARATORS = {
+    "dash": "-",
+    "hyphen": "-",
+    "-": "-",
+    "dot": ".",
+    ".": ".",
+    "underscore": "_",
+    "_": "_",
+}
+# Path separators become dashes; C0 control characters and DEL are dropped.
+_SUFFIX_TRANSLATION = str.maketrans(
+    {"/": "-", "\\": "-", "\x7f": None, **{chr(code): None for code in range(0x20)}}
+)
+
 
+@lru_cache(maxsize=1024)
 def normalize_invoice_date(invoice_date_iso: str | None, invoice_date_raw: str | None) -> str | None:
     for candidate in (invoice_date_iso, invoice_date_raw):
         normalized = normalize_date(candidate)
@@ -54,6 +84,7 @@ def normalize_invoice_date(invoice_date_iso: str | None, invoice_date_raw: str |
     return None
 
 
+@lru_cache(maxsize=1024)
 def normalize_date(value: str | None) -> str | None:
     if not value:
         return None
@@ -62,14 +93,28 @@ def normalize_date(value: str | None) -> str | None:
     if not text:
         return None
 
-    for fmt in _COMMON_DATE_FORMATS:
-        try:
-            return datetime.strptime(text, fmt).date().isoformat()
-        except ValueError:
-            continue
+    year_first = _YEAR_FIRST_DATE_RE.fullmatch(text)
+    if year_first:
+        year, _, month, day = year_first.groups()
+        return _iso_date(int(year), int(month), int(day))
+
+    # Four-digit-year numeric dates read day-first, falling back to month-first.
+    year_last = _YEAR_LAST_DATE_RE.fullmatch(text)
+    if year_last:
+        first, _, second, year = year_last.groups()
+        return _iso_date(int(year), int(second), int(first)) or _iso_date(int(year), int(first), int(second))
+
+    for shape_re, formats in _MONTH_NAME_DATE_FORMATS:
+        if shape_re.fullmatch(text):
+            for fmt in formats:
+                try:
+                    return datetime.strptime(text, fmt).date().isoformat()
+                except ValueError:
+                    continue
+            break
 
     # Prefer unambiguous slash/dash numeric parsing; default to MM/DD/YYYY for ambiguous forms.
-    numeric_match = re.fullmatch(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})", text)
+    numeric_match = _NUMERIC_DATE_RE.fullmatch(text)
     if numeric_match:
         first, second, year = (int(numeric_match.group(i)) for i in (1, 2, 3))
         if year < 100:
@@ -85,23 +130,31 @@ def normalize_date(value: str | None) -> str | None:
         except ValueError:
             return None
 
-    embedded_match = re.search(
-        r"\b(\d{4}-\d{2}-\d{2}|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|[A-Za-z]{3,9} \d{1,2}, \d{4}|\d{1,2} [A-Za-z]{3,9} \d{4})\b",
-        text,
-    )
-    if embedded_match:
+    # Only a date embedded in longer text is worth another pass; the whole text already failed.
+    embedded_match = _EMBEDDED_DATE_RE.search(text)
+    if embedded_match and embedded_match.group(1) != text:
         return normalize_date(embedded_match.group(1))
 
     return None
 
 
+def _iso_date(year: int, month: int, day: int) -> str | None:
+    try:
+        return datetime(year=year, month=month, day=day).date().isoformat()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
 def sanitize_short_description(value: str | None, max_words: int = 5) -> str:
     if not value:
         return "item"
 
     text = _ascii_fold(value).lower()
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    words = [w for w in text.split() if w]
+    if text.isascii():
+        words = text.translate(_ASCII_NON_ALNUM_TRANSLATION).split()
+    else:
+        words = _NON_ALNUM_RE.sub(" ", text).split()
     if not words:
         return "item"
     return " ".join(words[:max_words])
@@ -110,7 +163,7 @@ def sanitize_short_description(value: str | None, max_words: int = 5) -> str:
 def count_words(value: str | None) -> int:
     if not value:
         return 0
-    return len([w for w in value.split() if w])
+    return len(value.split())
 
 
 def make_filename_stub(invoice_date: str | None, short_description: str | None) -> str:
@@ -133,7 +186,7 @@ def make_filename_stub_with_options(
     date_part = format_invoice_date_for_filename(invoice_date, date_separator=date_sep)
 
     desc = sanitize_short_description(short_description)
-    desc_words = [w for w in desc.split() if w]
+    desc_words = desc.split()
     desc_part = sep.join(desc_words) if desc_words else "item"
 
     base = f"{date_part}{sep}{desc_part}"
@@ -148,7 +201,7 @@ def make_filename_stub_with_options(
 def format_invoice_date_for_filename(invoice_date: str | None, *, date_separator: str = "-") -> str:
     if not invoice_date:
         return "unknown-date"
-    if re.fullmatch(r"\d{4}-\d{2}-\d{2}", invoice_date):
+    if _ISO_DATE_RE.fullmatch(invoice_date):
         return invoice_date.replace("-", date_separator)
     return invoice_date
 
@@ -161,30 +214,12 @@ def normalize_filename_separator(value: str | None) -> str:
         if text == " ":
             return " "
         raw = text.strip().lower()
-    mapping = {
-        "underscore": "_",
-        "_": "_",
-        "dash": "-",
-        "hyphen": "-",
-        "-": "-",
-        "space": " ",
-        " ": " ",
-    }
-    return mapping.get(raw, "_")
+    return FILENAME_SEPARATORS.get(raw, "_")
 
 
 def normalize_filename_date_separator(value: str | None) -> str:
     raw = (value or "-").strip().lower()
-    mapping = {
-        "dash": "-",
-        "hyphen": "-",
-        "-": "-",
-        "dot": ".",
-        ".": ".",
-        "underscore": "_",
-        "_": "_",
-    }
-    return mapping.get(raw, "-")
+    return FILENAME_DATE_SEPARATORS.get(raw, "-")
 
 
 def sanitize_filename_suffix(value: str | None) -> str:
@@ -194,13 +229,24 @@ def sanitize_filename_suffix(value: str | None) -> str:
     if not cleaned:
         return ""
     # Keep user intent (e.g., "(KD)") but strip path separators/control chars.
-    cleaned = cleaned.replace("/", "-").replace("\\", "-")
-    cleaned = "".join(ch for ch in cleaned if ch >= " " and ch != "\x7f")
-    return cleaned
+    return cleaned.translate(_SUFFIX_TRANSLATION)
 
 
 def _ascii_fold(value: str) -> str:
-    # Preserve Polish letters during transliteration before generic accent stripping.
-    translated = value.translate(_POLISH_TRANSLITERATION)
-    normalized = unicodedata.normalize("NFKD", translated)
+    translated = value.translate(_ASCII_FOLD_TRANSLATION)
+    if translated.isascii():
+        return translated
+    return _strip_accents(translated)
+
+
+def _strip_accents(value: str) -> str:
+    normalized = unicodedata.normalize("NFKD", value)
     return "".join(ch for ch in normalized if not unicodedata.combining(ch))
+
+
+# Latin letters whose accent-stripped form is plain ASCII fold in a single str.translate, so typical
+# descriptions skip NFKD entirely. Polish letters come last: "ł" has no decomposition to strip.
+_ASCII_FOLD_TRANSLATION = {
+    **{code: folded for code in range(0x80, 0x250) if (folded := _strip_accents(chr(code))).isascii()},
+    **_POLISH_TRANSLITERATION,
+}
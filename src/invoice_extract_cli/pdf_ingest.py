@@ -1,8 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+import hashlib
+from itertools import repeat
+import os
 from pathlib import Path
+import re
+import stat
 import string
+from typing import Any
+
+from .cache import default_cache_dir, prune_json_cache, read_json_cache, touch_json_cache, write_json_cache
 
 
 INVOICE_HINTS = (
@@ -16,6 +26,30 @@ INVOICE_HINTS = (
     "tax",
 )
 
+# Quality scoring counts characters with C-level bytes/regex operations instead of a Python loop:
+# printable characters are the ASCII ones minus these control bytes, and alphanumerics are what
+# the word-character class keeps once underscores are excluded (the same set as str.isalnum).
+_NON_PRINTABLE_ASCII = bytes(code for code in range(128) if chr(code) not in string.printable)
+_ALNUM_RUN_RE = re.compile(r"[^\W_]+")
+
+# JPEG keeps uploads for scanned pages far smaller than PNG.
+IMAGE_MIME_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+}
+DEFAULT_JPEG_QUALITY = 85
+# Below this many pages, worker-process startup costs more than it saves.
+PARALLEL_RENDER_MIN_PAGES = 4
+# Oversized pages are downscaled so the rendered image's long edge stays within this bound.
+DEFAULT_MAX_LONG_EDGE_PX = 2000
+# Larger PDFs skip the embedded-text cache to bound its disk use.
+TEXT_CACHE_MAX_FILE_SIZE = 50 * 1024 * 1024
+# Embedded-text cache entries kept on disk; the least recently used ones are deleted beyond this.
+TEXT_CACHE_MAX_ENTRIES = 256
+# Rendered page sets kept in memory for the life of the process (a few MB each at most).
+RENDER_CACHE_MAX_ENTRIES = 4
+_RENDER_CACHE: OrderedDict[tuple[Any, ...], tuple[bytes, ...]] = OrderedDict()
+
 
 class PdfIngestError(RuntimeError):
     pass
@@ -37,45 +71,178 @@ class PdfTextExtraction:
     pages_examined: int
 
 
-def validate_input_pdf_path(pdf_path: Path) -> Path:
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-    if not pdf_path.is_file():
+class PdfSession:
+    """A PDF opened at most once and shared by text extraction and page rendering."""
+
+    def __init__(self, pdf_path: Path):
+        self.pdf_path = pdf_path
+        self._doc: Any | None = None
+
+    @property
+    def doc(self) -> Any:
+        # Opened on first use, so a session costs nothing when every step is served from cache.
+        if self._doc is None:
+            self._doc = _open_document(_import_fitz(), self.pdf_path)
+        return self._doc
+
+    def close(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self) -> PdfSession:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def open_pdf_session(pdf_path: Path) -> PdfSession:
+    return PdfSession(pdf_path)
+
+
+def validate_input_pdf_path(pdf_path: Path, stat_result: os.stat_result | None = None) -> Path:
+    if stat_result is None:
+        stat_result = stat_input_pdf_path(pdf_path)
+    if not stat.S_ISREG(stat_result.st_mode):
         raise IsADirectoryError(f"Path is not a file: {pdf_path}")
     if pdf_path.suffix.lower() != ".pdf":
         raise ValueError(f"Expected a .pdf file, got: {pdf_path.name}")
     return pdf_path
 
 
-def extract_embedded_text(pdf_path: Path, max_pages: int = 3) -> PdfTextExtraction:
-    fitz = _import_fitz()
+def stat_input_pdf_path(pdf_path: Path) -> os.stat_result:
+    # One stat answers both "exists" and "is a file"; callers pass the result on so
+    # validation and the text cache key don't hit the filesystem again.
+    try:
+        return os.stat(pdf_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError(f"PDF file not found: {pdf_path}") from None
+
+
+def pdf_fingerprint(pdf_path: Path) -> str:
+    # A digest of the file's bytes, so unlike the path/mtime text cache key it survives renames.
+    with open(pdf_path, "rb") as handle:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def extract_embedded_text(
+    pdf_path: Path,
+    max_pages: int = 3,
+    quality_short_circuit: float | None = None,
+    session: PdfSession | None = None,
+) -> PdfTextExtraction:
     max_pages = max(1, max_pages)
     try:
-        with fitz.open(pdf_path) as doc:
-            if getattr(doc, "needs_pass", False):
-                raise PasswordProtectedPdfError(f"PDF is password-protected: {pdf_path}")
-
+        with _document(pdf_path, session) as doc:
             page_texts: list[str] = []
+            # Each page is stripped once; its non-empty pieces are joined into combined_text.
+            combined_parts: list[str] = []
+            quality = _TextQualityAccumulator()
             page_count = min(len(doc), max_pages)
             for index in range(page_count):
-                page = doc[index]
-                text = page.get_text("text") or ""
-                page_texts.append(text)
+                page_text = _page_text(doc[index])
+                page_texts.append(page_text)
+                stripped = page_text.strip()
+                if stripped:
+                    combined_parts.append(stripped)
+                quality.feed(stripped)
+                # Stop reading further pages once the text seen so far is already good enough.
+                if (
+                    quality_short_circuit is not None
+                    and index + 1 < page_count
+                    and quality.score() >= quality_short_circuit
+                ):
+                    break
     except PasswordProtectedPdfError:
         raise
     except Exception as exc:  # pragma: no cover - depends on PyMuPDF exception types
         raise PdfIngestError(f"Failed to read PDF '{pdf_path}': {exc}") from exc
 
-    combined_text = "\n".join(t.strip() for t in page_texts if t.strip())
     return PdfTextExtraction(
         page_texts=page_texts,
-        combined_text=combined_text,
-        quality_score=score_text_quality(combined_text),
+        combined_text="\n".join(combined_parts),
+        quality_score=quality.score(),
         pages_examined=len(page_texts),
     )
 
 
+def extract_embedded_text_cached(
+    pdf_path: Path,
+    max_pages: int = 3,
+    quality_short_circuit: float | None = None,
+    cache_dir: Path | None = None,
+    stat_result: os.stat_result | None = None,
+    session: PdfSession | None = None,
+) -> PdfTextExtraction:
+    if stat_result is None:
+        stat_result = os.stat(pdf_path)
+    if stat_result.st_size > TEXT_CACHE_MAX_FILE_SIZE:
+        return extract_embedded_text(
+            pdf_path,
+            max_pages=max_pages,
+            quality_short_circuit=quality_short_circuit,
+            session=session,
+        )
+
+    key_source = (
+        f"{pdf_path.resolve()}|{stat_result.st_mtime_ns}|{stat_result.st_size}|{max_pages}|{quality_short_circuit}"
+    )
+    key = hashlib.blake2b(key_source.encode("utf-8"), digest_size=20).hexdigest()
+    cache_path = (cache_dir or default_cache_dir()) / "text" / f"{key}.json"
+
+    cached = read_json_cache(cache_path)
+    if isinstance(cached, dict):
+        try:
+            extraction = PdfTextExtraction(**cached)
+        except TypeError:
+            pass
+        else:
+            touch_json_cache(cache_path)
+            return extraction
+
+    extraction = extract_embedded_text(
+        pdf_path,
+        max_pages=max_pages,
+        quality_short_circuit=quality_short_circuit,
+        session=session,
+    )
+    write_json_cache(cache_path, asdict(extraction))
+    touch_json_cache(cache_path)
+    prune_json_cache(cache_path.parent, TEXT_CACHE_MAX_ENTRIES)
+    return extraction
+
+
 def render_pdf_pages_to_png_bytes(pdf_path: Path, max_pages: int = 3, dpi: int = 150) -> list[bytes]:
+    return render_pdf_pages(pdf_path, max_pages=max_pages, dpi=dpi, image_format="png")
+
+
+def render_pdf_pages_to_jpeg_bytes(
+    pdf_path: Path,
+    max_pages: int = 3,
+    dpi: int = 150,
+    quality: int = DEFAULT_JPEG_QUALITY,
+) -> list[bytes]:
+    return render_pdf_pages(pdf_path, max_pages=max_pages, dpi=dpi, image_format="jpeg", jpeg_quality=quality)
+
+
+def render_pdf_pages(
+    pdf_path: Path,
+    max_pages: int = 3,
+    dpi: int = 150,
+    image_format: str = "jpeg",
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+    max_long_edge_px: int = DEFAULT_MAX_LONG_EDGE_PX,
+    session: PdfSession | None = None,
+) -> list[bytes]:
+    if image_format not in IMAGE_MIME_TYPES:
+        raise ValueError(f"Unsupported image format: {image_format!r}")
+
     fitz = _import_fitz()
     max_pages = max(1, max_pages)
     dpi = max(72, dpi)
@@ -83,14 +250,33 @@ def render_pdf_pages_to_png_bytes(pdf_path: Path, max_pages: int = 3, dpi: int =
 
     rendered_pages: list[bytes] = []
     try:
-        with fitz.open(pdf_path) as doc:
-            if getattr(doc, "needs_pass", False):
-                raise PasswordProtectedPdfError(f"PDF is password-protected: {pdf_path}")
-
-            for index in range(min(len(doc), max_pages)):
-                page = doc[index]
-                pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
-                rendered_pages.append(pix.tobytes("png"))
+        with _document(pdf_path, session) as doc:
+            page_count = min(len(doc), max_pages)
+            workers = min(page_count, os.cpu_count() or 1)
+            parallel = page_count >= PARALLEL_RENDER_MIN_PAGES and workers > 1
+            if not parallel:
+                for index in range(page_count):
+                    rendered_pages.append(
+                        _render_page(fitz, doc[index], scale, image_format, jpeg_quality, max_long_edge_px)
+                    )
+
+        if parallel:
+            from concurrent.futures import ProcessPoolExecutor
+
+            # PyMuPDF is not thread-safe, so pages are rendered in worker processes,
+            # each with its own document handle.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_render_mp_context()) as executor:
+                rendered_pages = list(
+                    executor.map(
+                        _render_page_from_path,
+                        repeat(str(pdf_path)),
+                        range(page_count),
+                        repeat(scale),
+                        repeat(image_format),
+                        repeat(jpeg_quality),
+                        repeat(max_long_edge_px),
+                    )
+                )
     except PasswordProtectedPdfError:
         raise
     except Exception as exc:  # pragma: no cover - depends on PyMuPDF exception types
@@ -102,34 +288,158 @@ def render_pdf_pages_to_png_bytes(pdf_path: Path, max_pages: int = 3, dpi: int =
     return rendered_pages
 
 
-def score_text_quality(text: str) -> float:
-    if not text:
-        return 0.0
+def render_pdf_pages_cached(
+    pdf_path: Path,
+    max_pages: int = 3,
+    dpi: int = 150,
+    image_format: str = "jpeg",
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+    max_long_edge_px: int = DEFAULT_MAX_LONG_EDGE_PX,
+    stat_result: os.stat_result | None = None,
+    session: PdfSession | None = None,
+) -> list[bytes]:
+    # Same as render_pdf_pages, but a repeat request for an unchanged file (same path,
+    # mtime and size) within this process reuses the earlier rasterization.
+    if stat_result is None:
+        stat_result = os.stat(pdf_path)
+    key = (
+        os.path.abspath(pdf_path),
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+        max_pages,
+        dpi,
+        image_format,
+        jpeg_quality,
+        max_long_edge_px,
+    )
+    cached = _RENDER_CACHE.get(key)
+    if cached is not None:
+        _RENDER_CACHE.move_to_end(key)
+        return list(cached)
+
+    rendered = render_pdf_pages(
+        pdf_path,
+        max_pages=max_pages,
+        dpi=dpi,
+        image_format=image_format,
+        jpeg_quality=jpeg_quality,
+        max_long_edge_px=max_long_edge_px,
+        session=session,
+    )
+    _RENDER_CACHE[key] = tuple(rendered)
+    if len(_RENDER_CACHE) > RENDER_CACHE_MAX_ENTRIES:
+        _RENDER_CACHE.popitem(last=False)
+    return rendered
 
-    stripped = text.strip()
-    if not stripped:
-        return 0.0
 
-    length_score = min(len(stripped) / 1500.0, 1.0)
+def image_mime_type(image_format: str) -> str:
+    try:
+        return IMAGE_MIME_TYPES[image_format]
+    except KeyError:
+        raise ValueError(f"Unsupported image format: {image_format!r}") from None
+
 
-    printable_chars = sum(1 for c in stripped if c in string.printable)
-    printable_ratio = printable_chars / max(len(stripped), 1)
+def score_text_quality(text: str) -> float:
+    if not text:
+        return 0.0
+    quality = _TextQualityAccumulator()
+    quality.feed(text)
+    return quality.score()
+
+
+class _TextQualityAccumulator:
+    # Scores page texts as if their stripped, non-empty forms were joined by newlines, one page
+    # at a time, so the combined text is never re-scanned while pages are still being read. No
+    # hint contains a newline, so a hint can never straddle two pages.
+    __slots__ = ("_chars", "_printable_chars", "_alnum_chars", "_hints_found")
+
+    def __init__(self) -> None:
+        self._chars = 0
+        self._printable_chars = 0
+        self._alnum_chars = 0
+        self._hints_found: set[str] = set()
+
+    def feed(self, text: str) -> None:
+        stripped = text.strip()
+        if not stripped:
+            return
+        if self._chars:
+            # The joining newline is printable but not alphanumeric.
+            self._chars += 1
+            self._printable_chars += 1
+        self._chars += len(stripped)
+        self._printable_chars += len(stripped.encode("ascii", "ignore").translate(None, _NON_PRINTABLE_ASCII))
+        self._alnum_chars += len(stripped) - len(_ALNUM_RUN_RE.sub("", stripped))
+        lowered = stripped.lower()
+        self._hints_found.update(hint for hint in INVOICE_HINTS if hint in lowered)
+
+    def score(self) -> float:
+        if not self._chars:
+            return 0.0
+
+        length_score = min(self._chars / 1500.0, 1.0)
+        printable_ratio = self._printable_chars / self._chars
+        hint_score = min(len(self._hints_found) / 4.0, 1.0)
+        alpha_num_ratio = self._alnum_chars / self._chars
+
+        score = (
+            (0.45 * length_score)
+            + (0.20 * printable_ratio)
+            + (0.25 * hint_score)
+            + (0.10 * alpha_num_ratio)
+        )
+        return max(0.0, min(score, 1.0))
+
+
+def _open_document(fitz: Any, pdf_path: Path) -> Any:
+    doc = fitz.open(pdf_path)
+    if getattr(doc, "needs_pass", False):
+        doc.close()
+        raise PasswordProtectedPdfError(f"PDF is password-protected: {pdf_path}")
+    return doc
+
+
+def _document(pdf_path: Path, session: PdfSession | None) -> Any:
+    # A session's document stays open for the next step; otherwise open one just for this call.
+    if session is not None:
+        return nullcontext(session.doc)
+    return _open_document(_import_fitz(), pdf_path)
+
+
+def _page_text(page: Any) -> str:
+    return page.get_text("text") or ""
+
+
+def _render_page(fitz, page, scale: float, image_format: str, jpeg_quality: int, max_long_edge_px: int) -> bytes:
+    long_edge_pt = max(page.rect.width, page.rect.height)
+    if long_edge_pt > 0:
+        scale = min(scale, max_long_edge_px / long_edge_pt)
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    if image_format == "jpeg":
+        return pix.tobytes("jpeg", jpg_quality=jpeg_quality)
+    return pix.tobytes("png")
+
+
+def _render_page_from_path(
+    pdf_path: str,
+    index: int,
+    scale: float,
+    image_format: str,
+    jpeg_quality: int,
+    max_long_edge_px: int,
+) -> bytes:
+    fitz = _import_fitz()
+    with fitz.open(pdf_path) as doc:
+        return _render_page(fitz, doc[index], scale, image_format, jpeg_quality, max_long_edge_px)
 
-    lowered = stripped.lower()
-    hints_found = sum(1 for hint in INVOICE_HINTS if hint in lowered)
-    hint_score = min(hints_found / 4.0, 1.0)
 
-    alpha_num_ratio = (
-        sum(1 for c in stripped if c.isalnum()) / max(len(stripped), 1)
-    )
+def _render_mp_context() -> Any:
+    # Never fork: batch runs render from a worker thread while the event loop and HTTP client
+    # threads are alive, and a forked child can inherit a lock one of them held and deadlock.
+    import multiprocessing
 
-    score = (
-        (0.45 * length_score)
-        + (0.20 * printable_ratio)
-        + (0.25 * hint_score)
-        + (0.10 * alpha_num_ratio)
-    )
-    return max(0.0, min(score, 1.0))
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
 
 
 def looks_like_usable_text(quality_score: float, min_score: float = 0.45) -> bool:
@@ -1,9 +1,87 @@
-from __future__ import annotations
-
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _preimport_package_modules():
+    # Pays the package's import cost once, up front, instead of inside whichever test touches a
+    # module first. These modules only import the stdlib at load time; pydantic, PyMuPDF and
+    # google-genai stay lazy, so optional-dependency skips still happen per test module.
+    import invoice_extract_cli.config  # noqa: F401
+    import invoice_extract_cli.gemini_client  # noqa: F401
+    import invoice_extract_cli.normalize  # noqa: F401
+    import invoice_extract_cli.pdf_ingest  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def default_settings(tmp_path_factory: pytest.TempPathFactory):
+    # Resolved once from an empty directory with no INVOICE_EXTRACT_* variables; the settings
+    # object is frozen, so every test can share it.
+    from invoice_extract_cli.config import resolve_cli_settings
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(tmp_path_factory.mktemp("defaults"))
+        for name in [name for name in os.environ if name.startswith("INVOICE_EXTRACT_")]:
+            monkeypatch.delenv(name)
+        return resolve_cli_settings()
+
+
+@lru_cache(maxsize=None)
+def _ini_bytes(lines: tuple[str, ...]) -> bytes:
+    return "\n".join(["[invoice_extract]", *lines, ""]).encode("utf-8")
+
+
+@pytest.fixture
+def write_ini():
+    # Writes an [invoice_extract] section with the given "key = value" lines and returns the path.
+    # Each distinct body is joined and encoded once per session.
+    def _write(path: Path, *lines: str) -> Path:
+        path.write_bytes(_ini_bytes(lines))
+        return path
+
+    return _write
+
+
+@pytest.fixture(scope="session")
+def pydantic_module():
+    # Modules that need pydantic opt in with pytestmark; the skip check runs once per session.
+    return pytest.importorskip("pydantic")
+
+
+@pytest.fixture(scope="session")
+def sample_pdf(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Shared across the session: tests must not modify or delete it.
+    path = tmp_path_factory.mktemp("pdf") / "invoice.pdf"
+    path.write_bytes(b"%PDF-1.4")
+    return path
+
+
+@pytest.fixture
+def set_envs(monkeypatch: pytest.MonkeyPatch):
+    # Sets several environment variables at once; monkeypatch restores them after the test.
+    def _set(mapping: dict[str, str]) -> None:
+        for name, value in mapping.items():
+            monkeypatch.setenv(name, value)
+
+    return _set
+
+
+@pytest.fixture(scope="session")
+def cfg_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("cfg")
+
+
+@pytest.fixture
+def ini_path(cfg_dir: Path, request: pytest.FixtureRequest) -> Path:
+    # A per-test file in one shared directory, for tests that pass their config path explicitly
+    # (auto-discovery tests still need a directory of their own to chdir into).
+    return cfg_dir / f"{request.node.name}.ini"
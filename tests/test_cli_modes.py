@@ -1,10 +1,8 @@
-from __future__ import annotations
-
 from pathlib import Path
 
 import pytest
 
-pytest.importorskip("pydantic")
+pytestmark = pytest.mark.usefixtures("pydantic_module")
 
 from invoice_extract_cli.cli import (
     build_renamed_path,
@@ -12,7 +10,42 @@ from invoice_extract_cli.cli import (
     format_rename_message,
     perform_rename,
 )
-from invoice_extract_cli.models import ExtractionResult
+
+
+def _invoke_cli(*args: str):
+    import typer
+    from typer.testing import CliRunner
+
+    from invoice_extract_cli.cli import invoice_extract_command
+
+    app = typer.Typer()
+    app.command()(invoice_extract_command)
+    return CliRunner().invoke(app, list(args))
+
+
+def _write_text_pdf(path: Path, text: str) -> Path:
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    doc.new_page().insert_text((40, 40), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+# Clean embedded text with a labelled issue date and an item table, so try_local_extract answers it.
+LOCAL_INVOICE_TEXT = "\n".join(
+    [
+        "FAKTURA VAT / Invoice 12/02/2026",
+        "Data wystawienia: 10.02.2026",
+        "Sprzedawca: Kawa Sp. z o.o.",
+        "Nazwa towaru lub uslugi",
+        "Kawa ziarnista Lumar 1kg   2 szt   59,99",
+        *(f"Pozycja dodatkowa numer {index}   1 szt   10,00" for index in range(30)),
+        "Subtotal: 359,98",
+        "Tax: 82,80",
+        "Total: 442,78",
+    ]
+)
 
 
 def test_build_renamed_path_preserves_extension():
@@ -28,6 +61,8 @@ def test_format_rename_message():
 
 
 def test_format_detection_summary_includes_core_fields():
+    from invoice_extract_cli.models import ExtractionResult
+
     source = Path("/tmp/source.pdf")
     target = Path("/tmp/2026-02-10_kawa.pdf")
     result = ExtractionResult(
@@ -55,3 +90,298 @@ def test_perform_rename_moves_file(tmp_path: Path):
     perform_rename(source, target)
     assert not source.exists()
     assert target.exists()
+
+
+def test_classify_error_maps_exceptions_to_exit_codes():
+    from invoice_extract_cli.cli import EXIT_API_ERROR, EXIT_BAD_INPUT, EXIT_PDF_ERROR, _classify_error
+    from invoice_extract_cli.gemini_client import GeminiClientError
+    from invoice_extract_cli.pdf_ingest import PasswordProtectedPdfError
+
+    assert _classify_error(FileNotFoundError("missing")) == ("missing", EXIT_BAD_INPUT)
+    assert _classify_error(FileExistsError("taken")) == ("taken", EXIT_BAD_INPUT)
+    assert _classify_error(PasswordProtectedPdfError("locked")) == ("locked", EXIT_PDF_ERROR)
+    assert _classify_error(GeminiClientError("quota")) == ("quota", EXIT_API_ERROR)
+
+
+def test_extract_batch_overlaps_requests_and_keeps_failures_in_place(tmp_path: Path, monkeypatch):
+    import asyncio
+
+    from invoice_extract_cli import cli
+    from invoice_extract_cli.config import resolve_cli_settings
+    from invoice_extract_cli.models import ExtractionResult, GeminiResponseSchema
+
+    def fake_prepare(pdf_path, **kwargs):
+        if pdf_path.name == "broken.pdf":
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        return cli._PreparedExtraction(pdf_path, "pdf_text", [], text=pdf_path.stem)
+
+    class _FakeExtractor:
+        in_flight = 0
+        max_in_flight = 0
+
+        async def extract_async(self, *, text=None, images=None, mime_type="image/png"):
+            type(self).in_flight += 1
+            type(self).max_in_flight = max(type(self).max_in_flight, type(self).in_flight)
+            await asyncio.sleep(0.01)
+            type(self).in_flight -= 1
+            return GeminiResponseSchema(
+                invoice_date_iso="2026-02-10",
+                short_description=text,
+                confidence=0.9,
+            )
+
+    monkeypatch.setattr(cli, "_prepare_extraction", fake_prepare)
+    monkeypatch.setattr(cli, "GeminiInvoiceExtractor", lambda **kwargs: _FakeExtractor())
+    monkeypatch.chdir(tmp_path)
+    settings = resolve_cli_settings()
+    paths = [Path("kawa.pdf"), Path("broken.pdf"), Path("filtr.pdf")]
+
+    outcomes = asyncio.run(cli._extract_batch(paths, settings, None))
+
+    assert [o.filename_stub if isinstance(o, ExtractionResult) else type(o) for o in outcomes] == [
+        "2026-02-10_kawa",
+        FileNotFoundError,
+        "2026-02-10_filtr",
+    ]
+    assert _FakeExtractor.max_in_flight == 2
+
+
+def test_extract_batch_renders_multi_page_pdfs_in_non_forked_workers(tmp_path: Path, monkeypatch):
+    import asyncio
+    import concurrent.futures
+
+    fitz = pytest.importorskip("fitz")
+    from invoice_extract_cli import cli, pdf_ingest
+    from invoice_extract_cli.config import resolve_cli_settings_from_text
+    from invoice_extract_cli.models import ExtractionResult, GeminiResponseSchema
+
+    page_count = pdf_ingest.PARALLEL_RENDER_MIN_PAGES + 1
+    paths = []
+    for name in ("kawa", "filtr"):
+        doc = fitz.open()
+        for index in range(page_count):
+            doc.new_page().insert_text((72, 72), f"{name} page {index + 1}")
+        doc.save(tmp_path / f"{name}.pdf")
+        doc.close()
+        paths.append(tmp_path / f"{name}.pdf")
+
+    start_methods: list[str] = []
+
+    class _RecordingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, mp_context=None, **kwargs):
+            start_methods.append(mp_context.get_start_method() if mp_context else "default")
+            super().__init__(*args, mp_context=mp_context, **kwargs)
+
+    class _FakeExtractor:
+        async def extract_async(self, *, text=None, images=None, mime_type="image/png"):
+            return GeminiResponseSchema(
+                invoice_date_iso="2026-02-10",
+                short_description=f"{len(images)} pages",
+                confidence=0.9,
+            )
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _RecordingPool)
+    monkeypatch.setattr(cli, "GeminiInvoiceExtractor", lambda **kwargs: _FakeExtractor())
+    monkeypatch.setattr(pdf_ingest.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(pdf_ingest, "_RENDER_CACHE", type(pdf_ingest._RENDER_CACHE)())
+    settings = resolve_cli_settings_from_text("", ocr_mode="gemini", max_pages=page_count, cache=False)
+
+    outcomes = asyncio.run(cli._extract_batch(paths, settings, None))
+
+    assert all(isinstance(outcome, ExtractionResult) for outcome in outcomes), outcomes
+    assert [outcome.short_description for outcome in outcomes] == [f"{page_count} pages"] * 2
+    assert len(start_methods) == 2
+    assert "fork" not in start_methods and "default" not in start_methods
+
+
+def test_no_cache_keeps_invoice_text_off_disk(tmp_path: Path, monkeypatch):
+    from invoice_extract_cli import cli
+    from invoice_extract_cli.models import GeminiResponseSchema
+
+    pdf_path = _write_text_pdf(
+        tmp_path / "invoice.pdf", "Invoice\nInvoice Date: 2026-02-10\nKawa ziarnista 1kg\nTotal: 59.99"
+    )
+
+    def fake_extract(self, *, text=None, images=None, mime_type="image/png"):
+        return GeminiResponseSchema(invoice_date_iso="2026-02-10", short_description="kawa", confidence=0.9)
+
+    monkeypatch.setattr(cli.GeminiInvoiceExtractor, "extract", fake_extract)
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("INVOICE_EXTRACT_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("INVOICE_EXTRACT_GEMINI_API_KEY", "test-key")
+
+    result = _invoke_cli(str(pdf_path), "--no-cache", "--dry-run", "--ocr-mode", "auto")
+    assert result.exit_code == 0, result.output
+    assert not cache_dir.exists()
+
+    result = _invoke_cli(str(pdf_path), "--dry-run", "--ocr-mode", "auto")
+    assert result.exit_code == 0, result.output
+    assert len(list((cache_dir / "text").glob("*.json"))) == 1
+
+
+@pytest.mark.parametrize("names", [("missing.pdf",), ("missing.pdf", "gone.pdf")])
+def test_missing_pdf_is_reported_before_the_api_key(tmp_path: Path, monkeypatch, names: tuple[str, ...]):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("INVOICE_EXTRACT_GEMINI_API_KEY", raising=False)
+    monkeypatch.setenv("INVOICE_EXTRACT_CACHE_DIR", str(tmp_path / "cache"))
+
+    result = _invoke_cli(*(str(tmp_path / name) for name in names), "--dry-run")
+
+    assert result.exit_code == 2
+    assert "PDF file not found" in result.output
+    assert "INVOICE_EXTRACT_GEMINI_API_KEY" not in result.output
+
+
+@pytest.mark.parametrize("copies", [1, 2])
+def test_locally_extracted_pdfs_need_no_api_key(tmp_path: Path, monkeypatch, copies: int):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("INVOICE_EXTRACT_GEMINI_API_KEY", raising=False)
+    pdf_paths = [_write_text_pdf(tmp_path / f"scan{index}.pdf", LOCAL_INVOICE_TEXT) for index in range(copies)]
+
+    result = _invoke_cli(*map(str, pdf_paths), "--no-cache", "--dry-run", "--ocr-mode", "auto")
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count("2026-02-10_kawa_ziarnista_lumar_1kg.pdf") == copies
+
+
+def test_cached_rerun_needs_no_api_key(tmp_path: Path, monkeypatch):
+    from invoice_extract_cli import cli
+    from invoice_extract_cli.models import GeminiResponseSchema
+
+    requests: list[int] = []
+
+    def fake_extract(self, *, text=None, images=None, mime_type="image/png"):
+        requests.append(len(images or ()))
+        return GeminiResponseSchema(invoice_date_iso="2026-02-10", short_description="kawa", confidence=0.9)
+
+    monkeypatch.setattr(cli.GeminiInvoiceExtractor, "extract", fake_extract)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("INVOICE_EXTRACT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("INVOICE_EXTRACT_GEMINI_API_KEY", "test-key")
+    pdf_path = _write_text_pdf(tmp_path / "scan.pdf", "Kawa ziarnista 1kg")
+    args = (str(pdf_path), "--dry-run", "--ocr-mode", "gemini")
+
+    first = _invoke_cli(*args)
+    monkeypatch.delenv("INVOICE_EXTRACT_GEMINI_API_KEY")
+    second = _invoke_cli(*args)
+
+    assert first.exit_code == 0, first.output
+    assert second.exit_code == 0, second.output
+    assert second.output == first.output
+    assert requests == [1]
+
+
+def test_write_json_emits_utf8_after_pending_text(capsys):
+    from invoice_extract_cli.cli import _write_json
+
+    print("renaming", end="\n")
+    _write_json({"short_description": "kawa ziarnista żółta"})
+    assert capsys.readouterr().out == 'renaming\n{\n  "short_description": "kawa ziarnista żółta"\n}\n'
+
+
+def test_dump_results_matches_dict_serialization():
+    import orjson
+
+    from invoice_extract_cli.cli import _dump_results
+    from invoice_extract_cli.models import ExtractionResult
+
+    result = ExtractionResult(
+        source_file="faktura.pdf",
+        invoice_date="2026-02-10",
+        invoice_date_raw="10 lut 2026",
+        short_description="kawa żółta",
+        short_description_words=2,
+        filename_stub="2026-02-10_kawa_zolta",
+        extraction_method="pdf_text",
+        confidence=0.9,
+        warnings=["due date also present"],
+    )
+    expected = orjson.dumps(result.model_dump(), option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    assert _dump_results(result) == expected
+    assert _dump_results([result, result]) == orjson.dumps(
+        [result.model_dump()] * 2,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+    )
+
+
+def test_finalize_extraction_builds_well_typed_result():
+    from invoice_extract_cli.cli import _finalize_extraction, _PreparedExtraction
+    from invoice_extract_cli.models import ExtractionResult, GeminiResponseSchema
+
+    prepared = _PreparedExtraction(Path("/tmp/faktura.pdf"), "hybrid", ["borderline text"], text="x")
+    response = GeminiResponseSchema(
+        invoice_date_raw="10 lutego 2026",
+        invoice_date_iso="2026-02-10",
+        short_description="Kawa ziarnista",
+        confidence=0.8,
+        notes="due date also present",
+    )
+
+    result = _finalize_extraction(
+        prepared,
+        response,
+        filename_separator="_",
+        filename_suffix="",
+        filename_date_separator="-",
+    )
+
+    assert ExtractionResult.model_validate(result.model_dump()) == result
+    assert isinstance(result.short_description_words, int)
+    assert isinstance(result.confidence, float)
+    assert result.extraction_method == "hybrid"
+    assert result.warnings == ["borderline text", "due date also present"]
+    assert prepared.warnings == ["borderline text"]
+
+
+def test_run_invoice_extraction_reuses_stored_result_for_same_pdf_content(tmp_path: Path, monkeypatch):
+    from invoice_extract_cli import cli
+    from invoice_extract_cli.cache import ResponseCache
+    from invoice_extract_cli.models import ExtractionResult, GeminiResponseSchema
+
+    prepared_paths: list[Path] = []
+    requests: list[str | None] = []
+
+    def fake_prepare_from_pdf(validated_path, source_stat, **kwargs):
+        prepared_paths.append(validated_path)
+        return cli._PreparedExtraction(validated_path, "pdf_text", ["borderline"], text="kawa")
+
+    class _FakeExtractor:
+        def extract(self, *, text=None, images=None, mime_type="image/png"):
+            requests.append(text)
+            return GeminiResponseSchema(invoice_date_iso="2026-02-10", short_description="kawa", confidence=0.9)
+
+    def run(pdf_path: Path, refresh: bool = False) -> ExtractionResult:
+        response_cache = ResponseCache(tmp_path / "gemini.sqlite", ttl_seconds=60, refresh=refresh)
+        try:
+            return cli.run_invoice_extraction(
+                pdf_path=pdf_path,
+                api_key=None,
+                model="gemini-test",
+                locale="pl",
+                max_pages=3,
+                ocr_mode=cli.OcrMode.AUTO,
+                filename_separator="_",
+                filename_suffix="",
+                filename_date_separator="-",
+                timeout_seconds=10,
+                extractor=_FakeExtractor(),
+                response_cache=response_cache,
+            )
+        finally:
+            response_cache.close()
+
+    monkeypatch.setattr(cli, "_prepare_from_pdf", fake_prepare_from_pdf)
+    original = tmp_path / "scan.pdf"
+    original.write_bytes(b"%PDF-1.4 same bytes")
+    renamed = tmp_path / "2026-02-10_kawa.pdf"
+    renamed.write_bytes(original.read_bytes())
+
+    first = run(original)
+    second = run(renamed)
+    run(renamed, refresh=True)
+
+    assert prepared_paths == [original, renamed]
+    assert requests == ["kawa", "kawa"]
+    assert second.source_file == "2026-02-10_kawa.pdf"
+    assert second.model_dump(exclude={"source_file"}) == first.model_dump(exclude={"source_file"})
@@ -1,34 +1,35 @@
-from __future__ import annotations
-
 from pathlib import Path
+from typing import Final
 
 import pytest
 
-from invoice_extract_cli.config import ConfigError, resolve_cli_settings
-
-
-def test_resolve_cli_settings_reads_ini(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+from invoice_extract_cli.config import ConfigError, resolve_cli_settings, resolve_cli_settings_from_text
+from invoice_extract_cli.normalize import FILENAME_DATE_SEPARATORS, FILENAME_SEPARATORS
+
+# INI bodies shared by several tests, as the "key = value" lines passed to write_ini.
+_FULL_INI_LINES: Final = (
+    "model = gemini-x",
+    "locale = pl",
+    "max_pages = 5",
+    "ocr_mode = gemini",
+    "image_format = png",
+    "render_dpi = 200",
+    "dry_run = true",
+    "rename = false",
+    "filename_separator = space",
+    "filename_suffix = (KD)",
+    "filename_date_separator = dot",
+    "timeout_seconds = 42",
+    "debug = yes",
+)
+_ENV_OVERRIDDEN_INI_LINES: Final = ("model = gemini-from-file", "max_pages = 2", "rename = false")
+_BASE_INI_LINES: Final = ("model = base-model", "locale = pl", "dry_run = false", "max_pages = 2")
+_LOCAL_INI_LINES: Final = ("model = local-model", "dry_run = true", "max_pages = 4")
+
+
+def test_resolve_cli_settings_reads_ini(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, write_ini):
     monkeypatch.chdir(tmp_path)
-    cfg = tmp_path / "invoice-extract.ini"
-    cfg.write_text(
-        "\n".join(
-            [
-                "[invoice_extract]",
-                "model = gemini-x",
-                "locale = pl",
-                "max_pages = 5",
-                "ocr_mode = gemini",
-                "dry_run = true",
-                "rename = false",
-                "filename_separator = space",
-                "filename_suffix = (KD)",
-                "filename_date_separator = dot",
-                "timeout_seconds = 42",
-                "debug = yes",
-            ]
-        ),
-        encoding="utf-8",
-    )
+    cfg = write_ini(tmp_path / "invoice-extract.ini", *_FULL_INI_LINES)
 
     settings = resolve_cli_settings()
     assert settings.config_path == cfg
@@ -36,6 +37,8 @@ def test_resolve_cli_settings_reads_ini(tmp_path: Path, monkeypatch: pytest.Monk
     assert settings.locale == "pl"
     assert settings.max_pages == 5
     assert settings.ocr_mode == "gemini"
+    assert settings.image_format == "png"
+    assert settings.render_dpi == 200
     assert settings.dry_run is True
     assert settings.rename is False
     assert settings.filename_separator == " "
@@ -45,19 +48,19 @@ def test_resolve_cli_settings_reads_ini(tmp_path: Path, monkeypatch: pytest.Monk
     assert settings.debug is True
 
 
-def test_env_overrides_ini(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
-    cfg = tmp_path / "custom.ini"
-    cfg.write_text(
-        "[invoice_extract]\nmodel = gemini-from-file\nmax_pages = 2\nrename = false\n",
-        encoding="utf-8",
+def test_env_overrides_ini(ini_path: Path, write_ini, set_envs):
+    cfg = write_ini(ini_path, *_ENV_OVERRIDDEN_INI_LINES)
+    set_envs(
+        {
+            "INVOICE_EXTRACT_MODEL": "gemini-from-env",
+            "INVOICE_EXTRACT_LOCALE": "en",
+            "INVOICE_EXTRACT_MAX_PAGES": "9",
+            "INVOICE_EXTRACT_RENAME": "true",
+            "INVOICE_EXTRACT_FILENAME_SEPARATOR": "dash",
+            "INVOICE_EXTRACT_FILENAME_SUFFIX": "(KD)",
+            "INVOICE_EXTRACT_FILENAME_DATE_SEPARATOR": "dot",
+        }
     )
-    monkeypatch.setenv("INVOICE_EXTRACT_MODEL", "gemini-from-env")
-    monkeypatch.setenv("INVOICE_EXTRACT_LOCALE", "en")
-    monkeypatch.setenv("INVOICE_EXTRACT_MAX_PAGES", "9")
-    monkeypatch.setenv("INVOICE_EXTRACT_RENAME", "true")
-    monkeypatch.setenv("INVOICE_EXTRACT_FILENAME_SEPARATOR", "dash")
-    monkeypatch.setenv("INVOICE_EXTRACT_FILENAME_SUFFIX", "(KD)")
-    monkeypatch.setenv("INVOICE_EXTRACT_FILENAME_DATE_SEPARATOR", "dot")
 
     settings = resolve_cli_settings(config_path_override=cfg)
     assert settings.model == "gemini-from-env"
@@ -69,56 +72,64 @@ def test_env_overrides_ini(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
     assert settings.filename_date_separator == "."
 
 
-def test_cli_overrides_env(monkeypatch: pytest.MonkeyPatch):
-    monkeypatch.setenv("INVOICE_EXTRACT_MAX_PAGES", "7")
-    monkeypatch.setenv("INVOICE_EXTRACT_DEBUG", "false")
+def test_cli_overrides_env(set_envs):
+    set_envs({"INVOICE_EXTRACT_MAX_PAGES": "7", "INVOICE_EXTRACT_DEBUG": "false"})
 
     settings = resolve_cli_settings(max_pages=3, debug=True)
     assert settings.max_pages == 3
     assert settings.debug is True
 
 
-def test_default_locale_is_polish(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
-    monkeypatch.chdir(tmp_path)
-    settings = resolve_cli_settings()
-    assert settings.locale == "pl"
-    assert settings.filename_separator == "_"
-    assert settings.filename_suffix == ""
-    assert settings.filename_date_separator == "-"
+def test_default_locale_is_polish(default_settings):
+    assert default_settings.locale == "pl"
+    assert default_settings.image_format == "jpeg"
+    assert default_settings.filename_separator == "_"
+    assert default_settings.filename_suffix == ""
+    assert default_settings.filename_date_separator == "-"
+
+
+@pytest.mark.parametrize(
+    "ini_line",
+    [
+        "dry_run = maybe",
+        "filename_separator = dot",
+        "filename_date_separator = space",
+        "image_format = gif",
+        "ocr_mode = tesseract",
+        "max_pages = 0",
+        "render_dpi = high",
+    ],
+)
+def test_invalid_config_raises(ini_line: str):
+    with pytest.raises(ConfigError):
+        resolve_cli_settings_from_text(f"[invoice_extract]\n{ini_line}\n")
 
 
-def test_invalid_bool_in_config_raises(tmp_path: Path):
-    cfg = tmp_path / "bad.ini"
-    cfg.write_text("[invoice_extract]\ndry_run = maybe\n", encoding="utf-8")
-    with pytest.raises(ConfigError):
-        resolve_cli_settings(config_path_override=cfg)
+def test_filename_separator_accepts_literal_space():
+    settings = resolve_cli_settings_from_text("[invoice_extract]\nfilename_separator = space\n", max_pages=2)
+    assert settings.filename_separator == " "
+    assert settings.max_pages == 2
+    assert settings.config_path is None
 
 
-def test_invalid_filename_separator_raises(tmp_path: Path):
-    cfg = tmp_path / "bad-separator.ini"
-    cfg.write_text("[invoice_extract]\nfilename_separator = dot\n", encoding="utf-8")
-    with pytest.raises(ConfigError):
-        resolve_cli_settings(config_path_override=cfg)
+@pytest.mark.parametrize(("token", "separator"), sorted(FILENAME_SEPARATORS.items()))
+def test_every_filename_separator_token_is_accepted(token: str, separator: str):
+    assert resolve_cli_settings_from_text("", filename_separator=token).filename_separator == separator
 
 
-def test_filename_separator_accepts_literal_space(tmp_path: Path):
-    cfg = tmp_path / "space.ini"
-    cfg.write_text("[invoice_extract]\nfilename_separator = space\n", encoding="utf-8")
-    settings = resolve_cli_settings(config_path_override=cfg)
-    assert settings.filename_separator == " "
+@pytest.mark.parametrize(("token", "separator"), sorted(FILENAME_DATE_SEPARATORS.items()))
+def test_every_filename_date_separator_token_is_accepted(token: str, separator: str):
+    assert resolve_cli_settings_from_text("", filename_date_separator=token).filename_date_separator == separator
+
+
+def test_filename_suffix_is_sanitized_like_filenames():
+    assert resolve_cli_settings_from_text("", filename_suffix=" a/b\\c\x01 (KD) ").filename_suffix == "a-b-c (KD)"
 
 
-def test_local_ini_overrides_base_ini(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+def test_local_ini_overrides_base_ini(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, write_ini):
     monkeypatch.chdir(tmp_path)
-    (tmp_path / "invoice-extract.ini").write_text(
-        "[invoice_extract]\nmodel = base-model\nlocale = pl\ndry_run = false\nmax_pages = 2\n",
-        encoding="utf-8",
-    )
-    local_cfg = tmp_path / "invoice-extract.local.ini"
-    local_cfg.write_text(
-        "[invoice_extract]\nmodel = local-model\ndry_run = true\nmax_pages = 4\n",
-        encoding="utf-8",
-    )
+    write_ini(tmp_path / "invoice-extract.ini", *_BASE_INI_LINES)
+    local_cfg = write_ini(tmp_path / "invoice-extract.local.ini", *_LOCAL_INI_LINES)
 
     settings = resolve_cli_settings()
     assert settings.model == "local-model"
@@ -126,3 +137,50 @@ def test_local_ini_overrides_base_ini(tmp_path: Path, monkeypatch: pytest.Monkey
     assert settings.max_pages == 4
     assert settings.locale == "pl"
     assert settings.config_path == local_cfg
+
+
+def test_config_file_parse_is_reused_until_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, write_ini
+):
+    from invoice_extract_cli.config import _load_config_values
+
+    monkeypatch.chdir(tmp_path)
+    cfg = write_ini(tmp_path / "invoice-extract.ini", "model = gemini-a")
+
+    _load_config_values.cache_clear()
+    assert resolve_cli_settings().model == "gemini-a"
+    assert resolve_cli_settings().model == "gemini-a"
+    assert _load_config_values.cache_info().hits == 1
+
+    write_ini(cfg, "model = gemini-bb")
+    assert resolve_cli_settings().model == "gemini-bb"
+
+
+def test_local_extract_defaults_on_and_env_can_disable(
+    default_settings, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    assert default_settings.local_extract is True
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("INVOICE_EXTRACT_LOCAL_EXTRACT", "off")
+    assert resolve_cli_settings().local_extract is False
+
+
+def test_ini_syntax_beyond_key_equals_value_still_parses(ini_path: Path, write_ini):
+    cfg = write_ini(ini_path, "model: gemini-colon", "filename_suffix = 100%%", "Max_Pages = 4")
+
+    settings = resolve_cli_settings(config_path_override=cfg)
+    assert settings.model == "gemini-colon"
+    assert settings.filename_suffix == "100%"
+    assert settings.max_pages == 4
+
+
+def test_untouched_fields_keep_builtin_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(tmp_path)
+
+    settings = resolve_cli_settings(filename_separator="dash")
+    assert settings.filename_separator == "-"
+    assert settings.model == "gemini-2.0-flash"
+    assert settings.max_pages == 3
+    assert settings.timeout_seconds == 30
+    assert settings.config_path is None
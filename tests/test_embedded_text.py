@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+from invoice_extract_cli import pdf_ingest
+from invoice_extract_cli.pdf_ingest import extract_embedded_text, score_text_quality
+
+INVOICE_PAGE = """
+Invoice
+Invoice Date: 2026-02-10
+Bill To: Example LLC
+Subtotal: 120.00
+Tax: 12.00
+Total: 132.00
+""" + "Coffee beans 1kg 30.00\n" * 80
+
+
+class _FakePage:
+    def __init__(self, text: str):
+        self._text = text
+
+    def get_text(self, kind: str) -> str:
+        return self._text
+
+
+class _FakeDoc:
+    needs_pass = False
+
+    def __init__(self, texts: list[str]):
+        self._pages = [_FakePage(text) for text in texts]
+
+    def __enter__(self) -> "_FakeDoc":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = True
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __getitem__(self, index: int) -> _FakePage:
+        return self._pages[index]
+
+
+class _FakeFitz:
+    def __init__(self, texts: list[str]):
+        self._texts = texts
+        self.opened: list[_FakeDoc] = []
+
+    def open(self, pdf_path: Path) -> _FakeDoc:
+        doc = _FakeDoc(self._texts)
+        self.opened.append(doc)
+        return doc
+
+
+def test_extract_embedded_text_short_circuits_on_good_first_page(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(pdf_ingest, "_import_fitz", lambda: _FakeFitz([INVOICE_PAGE, "page 2", "page 3"]))
+
+    full = extract_embedded_text(Path("invoice.pdf"), max_pages=3)
+    short = extract_embedded_text(Path("invoice.pdf"), max_pages=3, quality_short_circuit=0.7)
+
+    assert full.pages_examined == 3
+    assert short.pages_examined == 1
+    assert short.quality_score >= 0.7
+
+
+def test_extract_embedded_text_scores_pages_like_the_combined_text(monkeypatch: pytest.MonkeyPatch):
+    texts = ["  Invoice\n", "", "Bill\x00 to: Zażółć\n", " \n", "Total 12.50\t"]
+    monkeypatch.setattr(pdf_ingest, "_import_fitz", lambda: _FakeFitz(texts))
+
+    extraction = extract_embedded_text(Path("invoice.pdf"), max_pages=5)
+
+    assert extraction.quality_score == score_text_quality(extraction.combined_text)
+
+
+def test_pdf_session_opens_document_once_and_closes_it(monkeypatch: pytest.MonkeyPatch):
+    fake_fitz = _FakeFitz([INVOICE_PAGE, "page 2"])
+    monkeypatch.setattr(pdf_ingest, "_import_fitz", lambda: fake_fitz)
+
+    with pdf_ingest.open_pdf_session(Path("invoice.pdf")) as session:
+        first = extract_embedded_text(Path("invoice.pdf"), max_pages=1, session=session)
+        second = extract_embedded_text(Path("invoice.pdf"), max_pages=2, session=session)
+
+    assert first.pages_examined == 1
+    assert second.pages_examined == 2
+    assert len(fake_fitz.opened) == 1
+    assert fake_fitz.opened[0].closed is True
+
+
+def test_extract_embedded_text_reads_text_drawn_after_transforms_and_paths(tmp_path: Path):
+    fitz = pytest.importorskip("fitz")
+    pdf_path = tmp_path / "vector-heavy.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 100), "Invoice Date: 2026-02-10")
+    xref = page.get_contents()[0]
+    # A large block of path operators and a "cm" transform both come before the text object.
+    drawing = b"0 0 m 10 10 l S\n" * 20_000
+    doc.update_stream(xref, b"q 1 0 0 1 0 -20 cm\n" + drawing + doc.xref_stream(xref) + b"\nQ\n")
+    doc.save(pdf_path)
+    doc.close()
+
+    extraction = extract_embedded_text(pdf_path, max_pages=1)
+
+    assert extraction.combined_text == "Invoice Date: 2026-02-10"
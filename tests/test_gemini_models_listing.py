@@ -1,8 +1,6 @@
-from __future__ import annotations
-
 import pytest
 
-pytest.importorskip("pydantic")
+pytestmark = pytest.mark.usefixtures("pydantic_module")
 
 from invoice_extract_cli.gemini_client import iter_models_from_response, model_metadata_to_public_dict
 
@@ -33,3 +31,9 @@ def test_model_metadata_to_public_dict_extracts_limits_and_methods():
     assert result["input_token_limit"] == 1048576
     assert result["output_token_limit"] == 8192
     assert result["supported_generation_methods"] == ["generateContent"]
+
+
+def test_model_metadata_to_public_dict_converts_nested_quota_metadata():
+    fake = _FakeModel(name="models/gemini-2.5-flash", quotas={"rpm": (15, None), 1: _FakeModel(tier="free")})
+    result = model_metadata_to_public_dict(fake)
+    assert result["quota_metadata"] == {"rpm": [15, None], "1": {"tier": "free"}}
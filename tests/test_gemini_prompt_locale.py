@@ -1,6 +1,4 @@
-from __future__ import annotations
-
-from invoice_extract_cli.gemini_client import build_text_prompt, build_vision_prompt
+from invoice_extract_cli.gemini_client import build_hybrid_prompt, build_text_prompt, build_vision_prompt
 
 
 def test_polish_locale_prompt_requests_polish_description():
@@ -11,3 +9,15 @@ def test_polish_locale_prompt_requests_polish_description():
 def test_english_locale_prompt_requests_english_description():
     prompt = build_vision_prompt("en")
     assert "Write short_description in English." in prompt
+
+
+def test_hybrid_prompt_mentions_text_and_image():
+    prompt = build_hybrid_prompt("pl")
+    assert "invoice text and first page image" in prompt
+    assert "Write short_description in Polish whenever possible" in prompt
+
+
+def test_prompts_are_built_once_per_locale():
+    for build_prompt in (build_text_prompt, build_vision_prompt, build_hybrid_prompt):
+        assert build_prompt("pl") is build_prompt("pl")
+        assert build_prompt("en") is not build_prompt("pl")
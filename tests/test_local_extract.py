@@ -0,0 +1,46 @@
+import pytest
+
+pytestmark = pytest.mark.usefixtures("pydantic_module")
+
+from invoice_extract_cli.local_extract import LOCAL_EXTRACT_CONFIDENCE, try_local_extract
+
+POLISH_CELL_PER_LINE = """FAKTURA VAT nr 12/02/2026
+Data wystawienia: 10.02.2026
+Sprzedawca: Kawa Sp. z o.o.
+Lp.
+Nazwa towaru lub usługi
+Ilość
+J.m.
+Cena netto
+1
+Kawa ziarnista Lumar 1kg
+2
+szt
+59,99
+"""
+
+
+def test_try_local_extract_reads_polish_issue_date_and_first_item():
+    response = try_local_extract(POLISH_CELL_PER_LINE, "pl")
+    assert response is not None
+    assert response.invoice_date_raw == "10.02.2026"
+    assert response.invoice_date_iso == "2026-02-10"
+    assert response.short_description == "Kawa ziarnista Lumar 1kg"
+    assert response.confidence == LOCAL_EXTRACT_CONFIDENCE
+
+
+def test_try_local_extract_reads_english_table_row():
+    text = "Invoice date: February 10, 2026\nDescription   Qty   Price\nMonitor arm dual   1   129.00\n"
+    response = try_local_extract(text, "en")
+    assert response is not None
+    assert response.invoice_date_iso == "2026-02-10"
+    assert response.short_description == "Monitor arm dual"
+
+
+def test_try_local_extract_defers_when_language_differs_from_locale():
+    assert try_local_extract(POLISH_CELL_PER_LINE, "en") is None
+
+
+def test_try_local_extract_ignores_seller_name_label():
+    text = "Data wystawienia 2026-02-10\nNazwa: ACME Sp. z o.o.\nNIP 1234567890\n"
+    assert try_local_extract(text, "pl") is None
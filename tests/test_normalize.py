@@ -1,4 +1,4 @@
-from __future__ import annotations
+import pytest
 
 from invoice_extract_cli.normalize import (
     count_words,
@@ -6,54 +6,74 @@ from invoice_extract_cli.normalize import (
     make_filename_stub_with_options,
     normalize_date,
     normalize_invoice_date,
+    sanitize_filename_suffix,
     sanitize_short_description,
 )
 
 
-def test_normalize_date_handles_iso():
-    assert normalize_date("2026-02-10") == "2026-02-10"
-
-
-def test_normalize_date_handles_textual_format():
-    assert normalize_date("10 Feb 2026") == "2026-02-10"
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("2026-02-10", "2026-02-10"),
+        ("10 Feb 2026", "2026-02-10"),
+        ("paid on 10 Feb 2026", "2026-02-10"),
+        # Date-shaped but unparseable text is rejected rather than guessed at.
+        ("Foo 10, 2026", None),
+        ("13/13/2026", None),
+    ],
+)
+def test_normalize_date(raw: str, expected: str | None):
+    assert normalize_date(raw) == expected
 
 
 def test_normalize_invoice_date_prefers_iso():
     assert normalize_invoice_date("2026-02-10", "02/10/2026") == "2026-02-10"
 
 
-def test_sanitize_short_description_enforces_word_limit_and_filename_safety():
-    value = sanitize_short_description("Ultra-Wide Monitor Arm (Black Edition)!!!", max_words=5)
-    assert value == "ultra wide monitor arm black"
-    assert count_words(value) == 5
+@pytest.mark.parametrize(
+    ("raw", "max_words", "expected"),
+    [
+        ("Ultra-Wide Monitor Arm (Black Edition)!!!", 5, "ultra wide monitor arm black"),
+        ("Ładowarka USB-C do kawy? żart", 5, "ladowarka usb c do kawy"),
+        # "ǘ" is in the one-step table; "ḿ" (Latin Extended Additional) still goes through NFKD.
+        ("Crème brûlée ǘ ḿ", 5, "creme brulee u m"),
+        ("Kawa ziarnista Lumar 1kg", 2, "kawa ziarnista"),
+        ("?!", 5, "item"),
+    ],
+)
+def test_sanitize_short_description(raw: str, max_words: int, expected: str):
+    value = sanitize_short_description(raw, max_words=max_words)
+    assert value == expected
+    assert count_words(value) == len(expected.split())
 
 
 def test_make_filename_stub_uses_fallbacks():
     assert make_filename_stub(None, None) == "unknown-date_item"
 
 
-def test_sanitize_short_description_transliterates_polish_chars():
-    value = sanitize_short_description("Ładowarka USB-C do kawy? żart", max_words=5)
-    assert value == "ladowarka usb c do kawy"
-
-
-def test_make_filename_stub_with_spaces_dots_and_suffix():
+@pytest.mark.parametrize(
+    ("invoice_date", "short_description", "filename_separator", "filename_date_separator", "expected"),
+    [
+        ("2026-02-09", "Etui iPhone 17 no 1", "space", "dot", "2026.02.09 etui iphone 17 no 1 (KD)"),
+        ("2026-02-17", "kawa ziarnista lumar", " ", "-", "2026-02-17 kawa ziarnista lumar (KD)"),
+    ],
+)
+def test_make_filename_stub_with_options(
+    invoice_date: str,
+    short_description: str,
+    filename_separator: str,
+    filename_date_separator: str,
+    expected: str,
+):
     stub = make_filename_stub_with_options(
-        invoice_date="2026-02-09",
-        short_description="Etui iPhone 17 no 1",
-        filename_separator="space",
+        invoice_date=invoice_date,
+        short_description=short_description,
+        filename_separator=filename_separator,
         filename_suffix="(KD)",
-        filename_date_separator="dot",
+        filename_date_separator=filename_date_separator,
     )
-    assert stub == "2026.02.09 etui iphone 17 no 1 (KD)"
+    assert stub == expected
 
 
-def test_make_filename_stub_with_literal_space_separator():
-    stub = make_filename_stub_with_options(
-        invoice_date="2026-02-17",
-        short_description="kawa ziarnista lumar",
-        filename_separator=" ",
-        filename_suffix="(KD)",
-        filename_date_separator="-",
-    )
-    assert stub == "2026-02-17 kawa ziarnista lumar (KD)"
+def test_sanitize_filename_suffix_strips_path_separators_and_control_chars():
+    assert sanitize_filename_suffix(" a/b\\c\x01\x7f (KD) ") == "a-b-c (KD)"
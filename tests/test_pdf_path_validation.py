@@ -1,5 +1,4 @@
-from __future__ import annotations
-
+import os
 from pathlib import Path
 
 import pytest
@@ -19,7 +18,20 @@ def test_validate_input_pdf_path_rejects_non_pdf(tmp_path: Path):
         validate_input_pdf_path(path)
 
 
-def test_validate_input_pdf_path_accepts_pdf(tmp_path: Path):
+def test_validate_input_pdf_path_accepts_pdf(sample_pdf: Path):
+    assert validate_input_pdf_path(sample_pdf) == sample_pdf
+
+
+def test_validate_input_pdf_path_rejects_directory(tmp_path: Path):
+    path = tmp_path / "folder.pdf"
+    path.mkdir()
+    with pytest.raises(IsADirectoryError):
+        validate_input_pdf_path(path)
+
+
+def test_validate_input_pdf_path_reuses_given_stat_result(tmp_path: Path):
     path = tmp_path / "invoice.pdf"
     path.write_bytes(b"%PDF-1.4")
-    assert validate_input_pdf_path(path) == path
+    stat_result = os.stat(path)
+    path.unlink()
+    assert validate_input_pdf_path(path, stat_result=stat_result) == path
@@ -1,24 +1,106 @@
-from __future__ import annotations
-
 import pytest
 
-pytest.importorskip("pydantic")
+pytestmark = pytest.mark.usefixtures("pydantic_module")
 
 from invoice_extract_cli.gemini_client import extract_json_object, parse_gemini_response_text
 
 
-def test_extract_json_object_from_fenced_block():
-    text = """```json
-    {"invoice_date_raw":"10 Feb 2026","invoice_date_iso":"2026-02-10","short_description":"monitor arm","confidence":0.9,"notes":null}
+@pytest.fixture(scope="module")
+def sample_payload() -> str:
+    return (
+        '{"invoice_date_raw":"10 Feb 2026","invoice_date_iso":"2026-02-10","short_description":"monitor arm",'
+        '"confidence":0.88,"notes":"due date also present"}'
+    )
+
+
+@pytest.fixture(scope="module")
+def parsed_response(sample_payload: str):
+    return parse_gemini_response_text(sample_payload)
+
+
+def test_extract_json_object_from_fenced_block(sample_payload: str):
+    text = f"""```json
+    {sample_payload}
     ```"""
-    payload = extract_json_object(text)
-    assert payload.startswith("{")
-    assert payload.endswith("}")
+    assert extract_json_object(text) == sample_payload
+
 
+def test_parse_gemini_response_text_validates_schema(parsed_response):
+    assert parsed_response.invoice_date_iso == "2026-02-10"
+    assert parsed_response.short_description == "monitor arm"
+    assert parsed_response.confidence == 0.88
 
-def test_parse_gemini_response_text_validates_schema():
+
+def test_parse_gemini_response_text_reads_plain_json_without_fence_scanning():
     response = parse_gemini_response_text(
-        '{"invoice_date_raw":"10 Feb 2026","invoice_date_iso":"2026-02-10","short_description":"monitor arm","confidence":0.88,"notes":"due date also present"}'
+        '{"short_description":"kawa","notes":"seen ```{\\"short_description\\": \\"x\\"}``` in footer"}'
     )
-    assert response.invoice_date_iso == "2026-02-10"
-    assert response.short_description == "monitor arm"
+    assert response.short_description == "kawa"
+
+
+def test_parse_gemini_response_text_reports_invalid_json_and_schema_errors():
+    from invoice_extract_cli.gemini_client import GeminiClientError
+
+    with pytest.raises(GeminiClientError, match="valid JSON"):
+        parse_gemini_response_text('Here you go: {"short_description": "kawa",}')
+    with pytest.raises(GeminiClientError, match="schema validation"):
+        parse_gemini_response_text('{"short_description": "kawa", "extra": 1}')
+
+
+def test_json_object_tracker_completes_on_closing_brace_across_chunks():
+    from invoice_extract_cli.gemini_client import JsonObjectTracker
+
+    tracker = JsonObjectTracker()
+    chunks = ['```json\n{"short_description": "arm {x', '} \\"y\\"", "notes": {"a": 1}', "}", "\n```"]
+    assert [tracker.feed(chunk) for chunk in chunks[:3]] == [False, False, True]
+
+
+def test_stream_reading_stops_after_json_object_is_complete():
+    from invoice_extract_cli.gemini_client import _read_stream_until_json_complete
+
+    class _Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    consumed = []
+
+    def stream():
+        for piece in ['{"short_description": "monitor', " ", 'arm"}', "\n```", "never read"]:
+            consumed.append(piece)
+            yield _Chunk(piece)
+
+    text = _read_stream_until_json_complete(stream())
+    assert text == '{"short_description": "monitor arm"}'
+    assert consumed[-1] == 'arm"}'
+
+
+def test_extract_many_runs_concurrently_and_keeps_failures_in_place(monkeypatch: pytest.MonkeyPatch):
+    import asyncio
+
+    from invoice_extract_cli.gemini_client import ExtractionPayload, GeminiClientError, GeminiInvoiceExtractor
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_generate(self, contents):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "broken" in contents[0]:
+            raise GeminiClientError("Gemini API request failed: boom")
+        return '{"invoice_date_iso":"2026-02-10","short_description":"kawa","confidence":0.9}'
+
+    monkeypatch.setattr(GeminiInvoiceExtractor, "_generate_content_async", fake_generate)
+    extractor = GeminiInvoiceExtractor(api_key="test-key")
+    payloads = [ExtractionPayload(text="kawa"), ExtractionPayload(text="broken"), ExtractionPayload(text="kawa")]
+
+    results = asyncio.run(extractor.extract_many(payloads, concurrency=2))
+
+    assert [type(result).__name__ for result in results] == [
+        "GeminiResponseSchema",
+        "GeminiClientError",
+        "GeminiResponseSchema",
+    ]
+    assert max_in_flight == 2
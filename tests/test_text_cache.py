@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import pytest
+
+from invoice_extract_cli import pdf_ingest
+from invoice_extract_cli.pdf_ingest import PdfTextExtraction, extract_embedded_text_cached
+
+
+def test_extract_embedded_text_cached_reuses_previous_result(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    pdf = tmp_path / "invoice.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    calls: list[int] = []
+
+    def fake_extract(
+        pdf_path: Path,
+        max_pages: int = 3,
+        quality_short_circuit: float | None = None,
+        session: object = None,
+    ) -> PdfTextExtraction:
+        calls.append(max_pages)
+        return PdfTextExtraction(
+            page_texts=["Invoice"],
+            combined_text="Invoice",
+            quality_score=0.5,
+            pages_examined=1,
+        )
+
+    monkeypatch.setattr(pdf_ingest, "extract_embedded_text", fake_extract)
+
+    first = extract_embedded_text_cached(pdf, max_pages=2, cache_dir=tmp_path / "cache")
+    second = extract_embedded_text_cached(pdf, max_pages=2, cache_dir=tmp_path / "cache")
+    assert first == second
+    assert calls == [2]
+
+    extract_embedded_text_cached(pdf, max_pages=3, cache_dir=tmp_path / "cache")
+    assert calls == [2, 3]
+
+
+def test_extract_embedded_text_cached_evicts_least_recently_used_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    pdf = tmp_path / "invoice.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    calls: list[int] = []
+
+    def fake_extract(pdf_path: Path, max_pages: int = 3, quality_short_circuit=None, session=None):
+        calls.append(max_pages)
+        return PdfTextExtraction(page_texts=["Invoice"], combined_text="Invoice", quality_score=0.5, pages_examined=1)
+
+    monkeypatch.setattr(pdf_ingest, "extract_embedded_text", fake_extract)
+    monkeypatch.setattr(pdf_ingest, "TEXT_CACHE_MAX_ENTRIES", 2)
+    cache_dir = tmp_path / "cache"
+
+    for max_pages in (1, 2, 1, 3):
+        extract_embedded_text_cached(pdf, max_pages=max_pages, cache_dir=cache_dir)
+    assert calls == [1, 2, 3]
+    assert len(list((cache_dir / "text").glob("*.json"))) == 2
+
+    # The entry for 2 pages was the least recently used, so it is the one that was dropped.
+    extract_embedded_text_cached(pdf, max_pages=1, cache_dir=cache_dir)
+    extract_embedded_text_cached(pdf, max_pages=2, cache_dir=cache_dir)
+    assert calls == [1, 2, 3, 2]
+
+
+def test_render_pdf_pages_cached_reuses_rasterization(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    def fake_render(pdf_path, max_pages=3, dpi=150, **kwargs):
+        calls.append((pdf_path, max_pages, dpi))
+        return [b"page-1", b"page-2"]
+
+    monkeypatch.setattr(pdf_ingest, "render_pdf_pages", fake_render)
+    monkeypatch.setattr(pdf_ingest, "_RENDER_CACHE", type(pdf_ingest._RENDER_CACHE)())
+    pdf_path = tmp_path / "invoice.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+
+    first = pdf_ingest.render_pdf_pages_cached(pdf_path, max_pages=2, dpi=150)
+    second = pdf_ingest.render_pdf_pages_cached(pdf_path, max_pages=2, dpi=150)
+    pdf_ingest.render_pdf_pages_cached(pdf_path, max_pages=2, dpi=200)
+
+    assert first == second == [b"page-1", b"page-2"]
+    assert [dpi for _, _, dpi in calls] == [150, 200]
+
+
+def test_response_cache_returns_payload_until_ttl_expires(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from invoice_extract_cli import cache
+    from invoice_extract_cli.cache import ResponseCache
+
+    now = 1_000_000
+    monkeypatch.setattr(cache.time, "time", lambda: now)
+    response_cache = ResponseCache(tmp_path / "gemini.sqlite", ttl_seconds=60)
+    response_cache.put("key", '{"short_description": "kawa"}')
+
+    assert response_cache.get("key") == '{"short_description": "kawa"}'
+    assert response_cache.get("other") is None
+
+    now += 61
+    assert response_cache.get("key") is None
+    response_cache.close()
+
+
+@pytest.mark.usefixtures("pydantic_module")
+def test_gemini_extractor_serves_repeated_requests_from_response_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    from invoice_extract_cli.cache import ResponseCache
+    from invoice_extract_cli.gemini_client import GeminiInvoiceExtractor
+
+    requests: list[object] = []
+
+    def fake_generate(self, contents):
+        requests.append(contents)
+        return '{"invoice_date_iso":"2026-02-10","short_description":"kawa","confidence":0.9}'
+
+    monkeypatch.setattr(GeminiInvoiceExtractor, "_generate_content", fake_generate)
+    response_cache = ResponseCache(tmp_path / "gemini.sqlite", ttl_seconds=60)
+    extractor = GeminiInvoiceExtractor(api_key="test-key", response_cache=response_cache)
+
+    first = extractor.extract(text="Invoice kawa")
+    second = extractor.extract(text="Invoice kawa")
+    extractor.extract(text="Invoice filtr")
+
+    assert first == second
+    assert len(requests) == 2
+    response_cache.close()
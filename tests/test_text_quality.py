@@ -1,14 +1,11 @@
-from __future__ import annotations
-
-from invoice_extract_cli.pdf_ingest import looks_like_usable_text, score_text_quality
+import string
 
+import pytest
 
-def test_score_text_quality_is_low_for_empty_text():
-    assert score_text_quality("") == 0.0
+from invoice_extract_cli.pdf_ingest import looks_like_usable_text, score_text_quality
 
 
-def test_score_text_quality_detects_invoice_like_text():
-    text = """
+INVOICE_TEXT = """
     Invoice
     Invoice Date: 2026-02-10
     Bill To: Example LLC
@@ -16,6 +13,19 @@ def test_score_text_quality_detects_invoice_like_text():
     Tax: 12.00
     Total: 132.00
     """
+
+
+@pytest.mark.parametrize(("text", "expect_usable"), [("", False), ("   \n\t", False), (INVOICE_TEXT, True)])
+def test_score_text_quality_is_bounded_and_flags_usable_text(text: str, expect_usable: bool):
     score = score_text_quality(text)
     assert 0.0 <= score <= 1.0
-    assert looks_like_usable_text(score)
+    assert looks_like_usable_text(score) is expect_usable
+
+
+def test_score_text_quality_counts_non_ascii_letters_and_control_characters():
+    text = "Faktura VAT\x00\x07 zażółć_gęślą 12,50 zł\x0c"
+    stripped = text.strip()
+    printable_ratio = sum(1 for c in stripped if c in string.printable) / len(stripped)
+    alpha_num_ratio = sum(1 for c in stripped if c.isalnum()) / len(stripped)
+    expected = 0.45 * (len(stripped) / 1500.0) + 0.20 * printable_ratio + 0.10 * alpha_num_ratio
+    assert score_text_quality(text) == pytest.approx(expected)